@@ -0,0 +1,134 @@
+"""Benchmark hors ligne des extracteurs sur un corpus HTML enregistré
+
+python3 bench/extract_bench.py                  # compare à bench/baseline.json
+python3 bench/extract_bench.py --update         # enregistre une nouvelle référence
+python3 bench/extract_bench.py --fixtures DIR   # autre corpus (fichiers *.html)
+
+Pour chaque extracteur de extractors.EXTRACTORS : temps de parsing, pic mémoire,
+longueur du texte extrait, taux de titres et d'images trouvés. Aucun accès réseau.
+
+La référence est locale (temps propres à la machine) : créée au premier passage, ignorée par git.
+"""
+
+import os, sys, json, time
+import argparse
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCH_DIR), "src"))
+
+import extractors
+
+# Seuils de régression par rapport à la référence
+SLOWER = 1.25      # temps > 125 % de la référence...
+SLOWER_MS = 1.0    # ...et plus d'1 ms d'écart (bruit de mesure)
+SHORTER = 0.90     # texte < 90 % de la référence
+
+
+def load_fixtures(fixtures_dir):
+    fixtures = []
+    for name in sorted(os.listdir(fixtures_dir)):
+        if name.endswith(".html"):
+            with open(os.path.join(fixtures_dir, name), 'rb') as f:
+                fixtures.append((name, f.read()))
+    return fixtures
+
+
+def measure(extractor, html, url, repeat):
+    """Temps médian sur `repeat` passages, pic mémoire sur un passage"""
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = extractor(html, url)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+
+    tracemalloc.start()
+    extractor(html, url)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return result, timings[len(timings) // 2], peak
+
+
+def run(fixtures, repeat):
+    report = {}
+    for name, extractor in extractors.EXTRACTORS:
+        rows = {}
+        for fixture, html in fixtures:
+            url = f"https://fixtures.local/{fixture}"
+            try:
+                result, seconds, peak = measure(extractor, html, url, repeat)
+            except Exception as e:
+                print(f"{name} / {fixture}: erreur {e}")
+                continue
+            rows[fixture] = {
+                'ms': round(seconds * 1000, 3),
+                'peak_kb': round(peak / 1024, 1),
+                'text': 0 if result['text'] == "No Text" else len(result['text']),
+                'title': result['title'] != "No Title",
+                'image': bool(result['image'])
+            }
+        count = len(rows) or 1
+        report[name] = {
+            'fixtures': rows,
+            'ms': round(sum(r['ms'] for r in rows.values()), 3),
+            'peak_kb': max((r['peak_kb'] for r in rows.values()), default=0),
+            'text': sum(r['text'] for r in rows.values()),
+            'title_rate': round(sum(r['title'] for r in rows.values()) / count, 3),
+            'image_rate': round(sum(r['image'] for r in rows.values()) / count, 3)
+        }
+    return report
+
+
+def compare(report, baseline):
+    """Liste des régressions (vitesse ou qualité) par rapport à la référence"""
+    regressions = []
+    for name, current in report.items():
+        for fixture, row in current['fixtures'].items():
+            ref = baseline.get(name, {}).get('fixtures', {}).get(fixture)
+            if not ref:
+                continue
+            label = f"{name} / {fixture}"
+            if row['ms'] > ref['ms'] * SLOWER and row['ms'] - ref['ms'] > SLOWER_MS:
+                regressions.append(f"{label}: {row['ms']} ms (référence {ref['ms']} ms)")
+            if row['text'] < ref['text'] * SHORTER:
+                regressions.append(f"{label}: texte {row['text']} car. (référence {ref['text']})")
+            for field in ('title', 'image'):
+                if ref[field] and not row[field]:
+                    regressions.append(f"{label}: {field} perdu")
+    return regressions
+
+
+def print_report(report):
+    print(f"{'extracteur':<12} {'ms':>10} {'pic Ko':>10} {'texte':>8} {'titres':>7} {'images':>7}")
+    for name, r in report.items():
+        print(f"{name:<12} {r['ms']:>10} {r['peak_kb']:>10} {r['text']:>8} {r['title_rate']:>7} {r['image_rate']:>7}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--fixtures', default=os.path.join(BENCH_DIR, "fixtures"))
+    parser.add_argument('--baseline', default=os.path.join(BENCH_DIR, "baseline.json"))
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--update', action='store_true', help="Enregistrer les résultats comme référence")
+    args = parser.parse_args()
+
+    fixtures = load_fixtures(args.fixtures)
+    print(f"{len(fixtures)} fixtures, {args.repeat} passages")
+    report = run(fixtures, args.repeat)
+    print_report(report)
+
+    if args.update or not os.path.exists(args.baseline):
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Référence enregistrée: {args.baseline}")
+        sys.exit(0)
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = compare(report, baseline)
+    for line in regressions:
+        print("RÉGRESSION", line)
+    sys.exit(1 if regressions else 0)
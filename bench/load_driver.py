@@ -0,0 +1,152 @@
+"""Charge de bout en bout : un coffre synthétique de daily notes passe par get_new_bookmarks
+
+python3 bench/load_driver.py --notes 200 --workers 8 --latency 80 --jitter 40
+
+Démarre le serveur de rejeu (bench/replay_server.py), écrit les notes dans un répertoire
+temporaire, puis mesure URLs/s et latences (p50, p90, p99, max) de resolve_redirects →
+get_article_from_source → Bookmarks.save_bookmark. Caches et registres sont isolés dans
+ce répertoire : le vrai _cache/ n'est pas touché.
+"""
+
+import os, sys, time
+import random
+import shutil
+import argparse
+import tempfile
+import threading
+from datetime import datetime, timedelta
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCH_DIR), "src"))
+sys.path.insert(0, BENCH_DIR)
+
+import replay_server
+import transport
+from papers import Bookmarks
+
+# Répartition des URLs du coffre synthétique
+MIX = [
+    ('article', 0.60),
+    ('redirect', 0.15),
+    ('challenge', 0.10),
+    ('slow', 0.05),
+    ('huge', 0.05),
+    ('pdf', 0.05),
+]
+
+
+class TimedBookmarks(Bookmarks):
+    """Bookmarks qui chronomètre chaque URL traitée"""
+
+    def __init__(self, config):
+        super().__init__(config)
+        self.latencies = []
+        self.latencies_lock = threading.Lock()
+
+    def fetch_and_save(self, url, *args):
+        start = time.perf_counter()
+        try:
+            return super().fetch_and_save(url, *args)
+        finally:
+            with self.latencies_lock:
+                self.latencies.append(time.perf_counter() - start)
+
+
+def make_url(kind, i, port, fixtures):
+    article = f"http://127.0.0.1:{port}"
+    fixture = fixtures[i % len(fixtures)]
+    if kind == 'redirect':
+        # Hôte « localhost » déclaré comme raccourcisseur : passe par resolve_redirects
+        return f"http://localhost:{port}/r/{1 + i % 3}/{fixture}?n={i}"
+    if kind == 'challenge':
+        return f"{article}/challenge/{fixture}?n={i}"
+    if kind == 'slow':
+        return f"{article}/slow/{fixture}?n={i}"
+    if kind == 'huge':
+        return f"{article}/huge/20?n={i}"
+    if kind == 'pdf':
+        return f"{article}/pdf?n={i}"
+    return f"{article}/article/{fixture}?n={i}"
+
+
+def make_vault(vault, notes, port, fixtures, seed):
+    """Écrit `notes` daily notes brutes (une URL et un commentaire chacune)"""
+    rng = random.Random(seed)
+    kinds = [kind for kind, _ in MIX]
+    weights = [weight for _, weight in MIX]
+    start = datetime(2025, 1, 1, 8, 0)
+    for i in range(notes):
+        kind = rng.choices(kinds, weights)[0]
+        name = (start + timedelta(minutes=7 * i)).strftime("%Y-%m-%d-%H%M") + ".md"
+        with open(os.path.join(vault, name), 'w', encoding='utf-8') as f:
+            f.write(f"Note de test {i}\n{make_url(kind, i, port, fixtures)}\n")
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, int(round(pct / 100 * len(values) + 0.5)) - 1))
+    return values[index]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--notes', type=int, default=200)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--per-host', type=int, default=8)
+    parser.add_argument('--latency', type=float, default=50, help="Latence du serveur (ms)")
+    parser.add_argument('--jitter', type=float, default=50, help="Latence aléatoire supplémentaire (ms)")
+    parser.add_argument('--host-rate', type=float, default=1000, help="Politesse par hôte (requêtes/s)")
+    parser.add_argument('--selenium', action='store_true', help="Garder le fallback Selenium (Chrome requis)")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--keep', action='store_true', help="Conserver le coffre temporaire")
+    args = parser.parse_args()
+
+    server = replay_server.start(0, latency=args.latency, jitter=args.jitter)
+    port = server.server_address[1]
+    fixtures = sorted(f for f in os.listdir(server.fixtures) if f.endswith(".html"))
+
+    work = tempfile.mkdtemp(prefix="papers-bench-")
+    vault = os.path.join(work, "Daily")
+    os.makedirs(vault)
+    make_vault(vault, args.notes, port, fixtures, args.seed)
+
+    config = {
+        'obsidian': vault,
+        'workers': args.workers,
+        'per_host': args.per_host,
+        'http_cache_dir': os.path.join(work, "http"),
+        'strategies_file': os.path.join(work, "strategies.json"),
+        'failures_file': os.path.join(work, "failures.json"),
+        'url_index_file': os.path.join(work, "urls.json"),
+        'vault_index_file': os.path.join(work, "vault.sqlite"),
+        'date_index_file': os.path.join(work, "dates.json"),
+        # Images des fixtures sur des hôtes réels : pas de réseau pendant la mesure
+        'cache_images': False,
+        'image_cache_dir': os.path.join(work, "images"),
+        'host_rate': args.host_rate,
+        'host_burst': args.host_rate,
+        'shorteners': ['localhost'],
+        'disabled_strategies': [] if args.selenium else ['selenium'],
+        'pool_per_host': max(args.workers, 4),
+    }
+    bookmarks = TimedBookmarks(config)
+
+    start = time.perf_counter()
+    count = bookmarks.get_new_bookmarks()
+    elapsed = time.perf_counter() - start
+    server.shutdown()
+
+    latencies = bookmarks.latencies
+    print()
+    print(f"{count} URLs en {elapsed:.2f}s : {count / elapsed:.1f} URLs/s ({args.workers} workers)")
+    print("Latence par URL : " + ", ".join(
+        f"p{p} {percentile(latencies, p) * 1000:.0f} ms" for p in (50, 90, 99)
+    ) + f", max {max(latencies, default=0) * 1000:.0f} ms")
+    print(transport.report())
+
+    if args.keep:
+        print(f"Coffre conservé: {work}")
+    else:
+        shutil.rmtree(work, ignore_errors=True)
@@ -0,0 +1,163 @@
+"""Serveur HTTP local qui rejoue des réponses enregistrées pour mesurer le pipeline sans le web
+
+python3 bench/replay_server.py --port 8765 --latency 80 --jitter 40
+
+Routes :
+    /article/<fichier>      page enregistrée (bench/fixtures/<fichier>), avec ETag
+    /r/<n>/<fichier>        chaîne de n redirections (301/302) vers /article/<fichier>, façon flip.it ou bit.ly
+    /challenge/<fichier>    403 façon Cloudflare (« Just a moment... »)
+    /slow/<fichier>         page envoyée au débit --slow-rate (octets/s)
+    /huge/<Mo>              page HTML de <Mo> mégaoctets, en streaming
+    /pdf                    document application/pdf
+"""
+
+import os, sys, time
+import random
+import hashlib
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+
+CHALLENGE = b"""<!DOCTYPE html><html><head><title>Just a moment...</title></head>
+<body><div id="challenge-running">Checking if the site connection is secure</div>
+<script src="/cdn-cgi/challenge-platform/h/b/orchestrate/jsch/v1"></script></body></html>"""
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+    server_version = "replay/1.0"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def delay(self):
+        latency = self.server.latency + random.uniform(0, self.server.jitter)
+        if latency > 0:
+            time.sleep(latency / 1000)
+
+    def fixture(self, name):
+        path = os.path.join(self.server.fixtures, os.path.basename(name))
+        try:
+            with open(path, 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def send_body(self, status, body, content_type="text/html; charset=utf-8", headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def do_HEAD(self):
+        self.do_GET()
+
+    def do_GET(self):
+        self.delay()
+        parts = self.path.split("?")[0].strip("/").split("/")
+        route = parts[0]
+
+        if route == "article" and len(parts) == 2:
+            body = self.fixture(parts[1])
+            if body is None:
+                return self.send_body(404, b"not found")
+            etag = '"' + hashlib.md5(body).hexdigest() + '"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                return self.end_headers()
+            return self.send_body(200, body, headers={"ETag": etag})
+
+        if route == "r" and len(parts) == 3:
+            hops = int(parts[1])
+            target = f"/r/{hops - 1}/{parts[2]}" if hops > 1 else f"/article/{parts[2]}"
+            self.send_response(301 if hops % 2 else 302)
+            self.send_header("Location", f"http://{self.server.article_host}{target}")
+            self.send_header("Content-Length", "0")
+            return self.end_headers()
+
+        if route == "challenge":
+            return self.send_body(403, CHALLENGE, headers={"Server": "cloudflare", "cf-mitigated": "challenge"})
+
+        if route == "slow" and len(parts) == 2:
+            body = self.fixture(parts[1])
+            if body is None:
+                return self.send_body(404, b"not found")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            step = max(1, self.server.slow_rate // 10)
+            for i in range(0, len(body), step):
+                self.wfile.write(body[i:i + step])
+                self.wfile.flush()
+                time.sleep(0.1)
+            return
+
+        if route == "huge" and len(parts) == 2:
+            size = int(float(parts[1]) * 1024 * 1024)
+            chunk = b"<p>" + b"lorem ipsum " * 80 + b"</p>\n"
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(size))
+            self.end_headers()
+            if self.command == "HEAD":
+                return
+            sent = 0
+            try:
+                while sent < size:
+                    data = chunk[:size - sent]
+                    self.wfile.write(data)
+                    sent += len(data)
+            except (BrokenPipeError, ConnectionResetError):
+                # Le client a atteint son plafond et fermé la connexion
+                self.close_connection = True
+            return
+
+        if route == "pdf":
+            return self.send_body(200, b"%PDF-1.4\n" + b"0" * 200000, content_type="application/pdf")
+
+        return self.send_body(404, b"not found")
+
+
+def start(port=8765, fixtures=None, latency=0, jitter=0, slow_rate=2048, verbose=False):
+    """Démarre le serveur dans un thread ; retourne l'instance (server.shutdown() pour l'arrêter)"""
+    server = ThreadingHTTPServer(("127.0.0.1", port), ReplayHandler)
+    server.daemon_threads = True
+    server.fixtures = fixtures or os.path.join(BENCH_DIR, "fixtures")
+    server.latency = latency
+    server.jitter = jitter
+    server.slow_rate = slow_rate
+    server.verbose = verbose
+    server.article_host = f"127.0.0.1:{server.server_address[1]}"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--fixtures', default=os.path.join(BENCH_DIR, "fixtures"))
+    parser.add_argument('--latency', type=float, default=0, help="Latence ajoutée (ms)")
+    parser.add_argument('--jitter', type=float, default=0, help="Latence aléatoire supplémentaire (ms)")
+    parser.add_argument('--slow-rate', type=int, default=2048, help="Débit de /slow (octets/s)")
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+
+    server = start(args.port, args.fixtures, args.latency, args.jitter, args.slow_rate, args.verbose)
+    print(f"Serveur de rejeu sur http://127.0.0.1:{server.server_address[1]}/ (Ctrl-C pour arrêter)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+        sys.exit(0)
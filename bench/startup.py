@@ -0,0 +1,123 @@
+"""Temps de démarrage (python -X importtime) des points d'entrée, sans réseau ni coffre
+
+python3 bench/startup.py                 # compare à bench/startup_baseline.json
+python3 bench/startup.py --update        # enregistre une nouvelle référence
+python3 bench/startup.py --max-ms 1000   # échoue si un point d'entrée dépasse ce budget
+
+Chaque cible est importée dans un interpréteur neuf ; on relève le temps cumulé des imports,
+les modules les plus coûteux et les dépendances lourdes chargées alors qu'aucun article
+n'a encore été extrait.
+
+La référence est locale (temps propres à la machine) : créée au premier passage, ignorée par git.
+"""
+
+import os, sys, json
+import argparse
+import subprocess
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.join(os.path.dirname(BENCH_DIR), "src")
+
+# web.py et news.py travaillent dès l'import : on mesure les modules qu'ils importent
+TARGETS = {
+    'papers': "import papers",
+    'web': "import flask, markdown, tools, papers",
+    'news': "import masto, papers, tools, transport",
+}
+
+# Dépendances qui ne doivent être chargées que par le chemin de code qui s'en sert
+HEAVY = ['selenium', 'newspaper', 'nltk', 'cloudscraper', 'bs4', 'lxml', 'urllib3', 'requests']
+
+# Seuils de régression par rapport à la référence
+SLOWER = 1.25      # temps > 125 % de la référence...
+SLOWER_MS = 20.0   # ...et plus de 20 ms d'écart (bruit de mesure)
+
+
+def importtime(code):
+    """Lignes (self_us, cumulative_us, profondeur, module) de -X importtime"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=SRC_DIR, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((int(self_us), int(cumulative), depth, name.strip()))
+    return rows
+
+
+def measure(code, repeat):
+    """Meilleur temps cumulé sur `repeat` interpréteurs neufs"""
+    best = None
+    for _ in range(repeat):
+        rows = importtime(code)
+        total = sum(cumulative for _, cumulative, depth, _ in rows if depth == 0)
+        if best is None or total < best[0]:
+            best = (total, rows)
+
+    total, rows = best
+    loaded = {name.split(".")[0] for _, _, _, name in rows}
+    top = sorted(((name, cumulative) for _, cumulative, depth, name in rows if depth == 0), key=lambda r: -r[1])
+    return {
+        'ms': round(total / 1000, 1),
+        'modules': len(rows),
+        'heavy': [name for name in HEAVY if name in loaded],
+        'top': [[name, round(cumulative / 1000, 1)] for name, cumulative in top[:5]]
+    }
+
+
+def compare(report, baseline):
+    """Liste des régressions par rapport à la référence"""
+    regressions = []
+    for target, row in report.items():
+        ref = baseline.get(target)
+        if not ref:
+            continue
+        if row['ms'] > ref['ms'] * SLOWER and row['ms'] - ref['ms'] > SLOWER_MS:
+            regressions.append(f"{target}: {row['ms']} ms (référence {ref['ms']} ms)")
+        for name in row['heavy']:
+            if name not in ref['heavy']:
+                regressions.append(f"{target}: {name} importé au démarrage")
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--baseline', default=os.path.join(BENCH_DIR, "startup_baseline.json"))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--max-ms', type=float, default=0, help="Budget de démarrage par cible (0 = aucun)")
+    parser.add_argument('--update', action='store_true', help="Enregistrer les résultats comme référence")
+    args = parser.parse_args()
+
+    report = {}
+    for target, code in TARGETS.items():
+        try:
+            report[target] = row = measure(code, args.repeat)
+        except RuntimeError as e:
+            print(f"{target}: erreur {e}")
+            continue
+        print(f"{target:<8} {row['ms']:>8} ms  {row['modules']:>4} modules  lourds: {', '.join(row['heavy']) or '-'}")
+        for name, ms in row['top']:
+            print(f"{'':<10}{ms:>8} ms  {name}")
+
+    regressions = []
+    if args.max_ms:
+        regressions += [f"{t}: {r['ms']} ms > budget {args.max_ms} ms" for t, r in report.items() if r['ms'] > args.max_ms]
+
+    if report and (args.update or not os.path.exists(args.baseline)):
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Référence enregistrée: {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions += compare(report, json.load(f))
+
+    for line in regressions:
+        print("RÉGRESSION", line)
+    sys.exit(1 if regressions else 0)
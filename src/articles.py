@@ -1,25 +1,264 @@
 # python3 src/articles.py
 
-import requests
+import os
+import atexit
 from urllib.parse import urljoin, urlparse
-from newspaper import Article
 import time
-import random
-import re
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from bs4 import BeautifulSoup
-import cloudscraper
-import urllib3
-import ssl
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturesTimeout
+from concurrent.futures.process import BrokenProcessPool
 from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
 
+import tools
+import transport
+from httpcache import HttpCache
+import extractors
+import htmltree
+import failures
+from engine import ExtractionEngine, RunBudget, NotAnArticle, is_network_failure
+from scoreboard import StrategyBoard
+from ratelimit import HostLimiter
+
+# Paramètres issus de _param.yml (voir configure)
+config = {}
+_http_cache = None
+_strategy_board = None
+_driver_pool = None
+_limiter = None
+_failures = None
+_engine = None
+_parser_pool = None
+_init_lock = threading.RLock()
+
+
+def configure(new_config):
+    """Transmet la configuration du projet aux extracteurs"""
+    config.update(new_config or {})
+    transport.configure(config)
+    htmltree.set_backend(config.get('html_parser', 'lxml'))
+
+
+def http_cache():
+    """Cache disque partagé des réponses HTTP (créé au premier usage)"""
+    global _http_cache
+    with _init_lock:
+        if _http_cache is None:
+            cache_dir = config.get('http_cache_dir') or tools.cache_dir("http")
+            max_bytes = int(config.get('http_cache_mb', 200)) * 1024 * 1024
+            _http_cache = HttpCache(cache_dir, max_bytes)
+            atexit.register(_http_cache.flush)
+        return _http_cache
+
+
+def strategy_board():
+    """Tableau persistant des stratégies par domaine (créé au premier usage)"""
+    global _strategy_board
+    with _init_lock:
+        if _strategy_board is None:
+            path = config.get('strategies_file') or os.path.join(tools.cache_dir(), "strategies.json")
+            _strategy_board = StrategyBoard(path, int(config.get('strategy_skip_after', 3)))
+        return _strategy_board
+
+
+def driver_pool():
+    """Pool de navigateurs headless partagé (créé au premier usage, fermé à la sortie)"""
+    global _driver_pool
+    with _init_lock:
+        if _driver_pool is None:
+            from browser import DriverPool
+
+            _driver_pool = DriverPool(int(config.get('selenium_drivers', 2)), int(config.get('selenium_timeout', 15)))
+            atexit.register(_driver_pool.close)
+        return _driver_pool
+
+
+def limiter():
+    """Seaux à jetons par hôte partagés par tous les fetchers"""
+    global _limiter
+    with _init_lock:
+        if _limiter is None:
+            _limiter = HostLimiter(
+                float(config.get('host_rate', 0.5)),
+                float(config.get('host_burst', 2)),
+                config.get('host_rates') or {}
+            )
+        return _limiter
+
+
+# Types de contenu acceptés comme page d'article
+HTML_TYPES = ('text/html', 'application/xhtml+xml', 'application/xml', 'text/xml', 'text/plain')
+
+
+def sniff_html(chunk):
+    """Devine si un début de corps sans Content-Type exploitable est du HTML"""
+    head = chunk[:1024].lstrip().lower()
+    if head.startswith(b'%pdf'):
+        return False
+    return head.startswith(b'<') or b'<html' in head or b'<!doctype' in head
+
+
+def read_body(response, max_bytes):
+    """
+    Lit le corps d'une réponse en streaming.
+    S'arrête dès les en-têtes si le contenu n'est pas du HTML, et au plafond max_bytes sinon.
+
+    Returns:
+        (contenu, raison du refus ou None, tronqué ?)
+    """
+    content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+    if content_type and content_type not in HTML_TYPES and content_type != 'application/octet-stream':
+        response.close()
+        return b"", f"contenu {content_type}", False
+
+    length = response.headers.get('Content-Length', '')
+    if length.isdigit() and int(length) > max_bytes:
+        print(f"Page volumineuse ({length} octets), lecture limitée à {max_bytes} octets")
+
+    chunks = []
+    size = 0
+    truncated = False
+    try:
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            if not chunks and content_type in ('', 'application/octet-stream') and not sniff_html(chunk):
+                return b"", f"contenu non HTML ({content_type or 'sans type'})", False
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= max_bytes:
+                truncated = True
+                break
+    finally:
+        response.close()
+
+    return b"".join(chunks)[:max_bytes], None, truncated
+
+
+def failure_registry():
+    """Registre persistant des URLs et hôtes en échec (voir failures.py)"""
+    global _failures
+    with _init_lock:
+        if _failures is None:
+            _failures = failures.from_config(config)
+        return _failures
+
+
+def run_budget():
+    """Nouveau budget de session (run_budget_minutes, 0 = illimité)"""
+    return RunBudget(float(config.get('run_budget_minutes', 0)) * 60)
+
+
+def engine():
+    """Moteur de tentatives : délai par URL (url_deadline) et budget de session (run_budget_minutes)"""
+    global _engine
+    with _init_lock:
+        if _engine is None:
+            _engine = ExtractionEngine(fetch, strategy_board(), float(config.get('url_deadline', 90)), run_budget(), parse)
+        return _engine
+
+
+def parser_pool():
+    """
+    Crée le pool de processus de parsing (parse_workers, 0 = dans le thread du téléchargement).
+    Les processus sont créés par fork dès l'appel : à appeler explicitement au début des points
+    d'entrée (get_new_bookmarks, watch.py, news.py), avant tout thread ou accès réseau.
+    Sans fork (macOS, Windows), le parsing reste dans le thread du téléchargement.
+    """
+    global _parser_pool
+    with _init_lock:
+        workers = int(config.get('parse_workers', 0))
+        context = tools.fork_context()
+        if _parser_pool is None and workers > 0 and context is not None:
+            _parser_pool = ProcessPoolExecutor(workers, mp_context=context)
+            _parser_pool.submit(int).result()
+            atexit.register(_parser_pool.shutdown)
+        return _parser_pool
+
+
+def parse(html_content, url, timeout=None):
+    """
+    Extraction CPU (newspaper, sélecteurs) hors du GIL des threads réseau si le pool a été créé
+    (jamais créé ici : voir parser_pool). Au-delà de timeout (s), la page est abandonnée (None).
+    """
+    global _parser_pool
+    pool = _parser_pool
+    if pool is not None:
+        try:
+            future = pool.submit(extractors.extract, html_content, url)
+            return future.result(timeout=timeout)
+        except FuturesTimeout:
+            future.cancel()
+            print(f"Parsing abandonné après {timeout:.0f}s: {url}")
+            return None
+        except BrokenProcessPool as e:
+            print(f"Pool de parsing hors service, parsing local: {e}")
+            with _init_lock:
+                config['parse_workers'] = 0
+                _parser_pool = None
+    return extractors.extract(html_content, url)
+
+
+def cached_get(client, url, headers=None, timeout=15, verify=True):
+    """
+    GET à travers le cache disque : si une copie existe, envoie une requête conditionnelle
+    (If-None-Match / If-Modified-Since) et réutilise le corps en cache sur un 304.
+    Le corps est lu en streaming et plafonné à max_page_mb (voir read_body), puis décodé
+    selon le charset de la réponse (voir htmltree.decode_html).
+
+    Args:
+        client: session de transport.py (requests.Session ou scraper cloudscraper)
+        url: L'URL à télécharger
+
+    Returns:
+        Dictionnaire {'status', 'content', 'url', 'reason', 'truncated'}
+    """
+    cache = http_cache()
+    entry = cache.get(url)
+    limiter().wait(url)
+
+    request_headers = dict(headers or {})
+    request_headers.update(cache.conditional_headers(entry))
+
+    response = client.get(url, headers=request_headers, timeout=timeout, allow_redirects=True, verify=verify, stream=True)
+
+    if response.status_code == 304 and entry:
+        response.close()
+        print(f"Cache HTTP valide: {url}")
+        content = htmltree.decode_html(entry['body'], entry.get('content_type'))
+        return {'status': 200, 'content': content, 'url': entry['final_url'], 'reason': None, 'truncated': False}
+
+    if response.status_code != 200:
+        response.close()
+        return {'status': response.status_code, 'content': b"", 'url': response.url, 'reason': None, 'truncated': False}
+
+    max_bytes = int(float(config.get('max_page_mb', 5)) * 1024 * 1024)
+    content, reason, truncated = read_body(response, max_bytes)
+    if reason:
+        print(f"Téléchargement interrompu ({reason}): {url}")
+    elif truncated:
+        print(f"Page tronquée à {max_bytes} octets: {url}")
+
+    # Sans validateur, une copie ne pourrait jamais être revalidée ; pas de copie partielle
+    if not reason and not truncated and (response.headers.get('ETag') or response.headers.get('Last-Modified')):
+        cache.put(url, response.url, content, response.headers)
+
+    if not reason:
+        content = htmltree.decode_html(content, response.headers.get('Content-Type'))
+    return {'status': 200, 'content': content, 'url': response.url, 'reason': reason, 'truncated': truncated}
+
+
+def fetch_page(client, url, headers=None, verify=True, timeout=15):
+    """Télécharge une page (via le cache) ; lève une exception si le statut n'est pas 200"""
+    page = cached_get(client, url, headers=headers, timeout=timeout, verify=verify)
+    if page['status'] != 200:
+        raise Exception(f"Téléchargement échoué ({page['status']}) pour {page['url']}")
+    if page['reason']:
+        raise NotAnArticle(page['reason'])
+    return page
+
 
 def resolve_redirects(url, max_redirects=10):
     """Résout les redirections manuellement pour gérer les liens comme flip.it"""
-    session = requests.Session()
-    session.headers.update({
+    session = transport.session()
+    headers = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36',
         'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
         'Accept-Language': 'en-US,en;q=0.9,fr;q=0.8',
@@ -27,16 +266,24 @@ def resolve_redirects(url, max_redirects=10):
         'DNT': '1',
         'Connection': 'keep-alive',
         'Upgrade-Insecure-Requests': '1',
-    })
+    }
     
+    cached = http_cache().get(url, kind="HEAD")
+    if cached:
+        print(f"Redirection en cache: {cached['final_url']}")
+        return cached['final_url']
+
     current_url = url
     redirect_count = 0
+    status = None
     
     try:
         while redirect_count < max_redirects:
             print(f"Résolution redirect {redirect_count + 1}: {current_url}")
             
-            response = session.head(current_url, allow_redirects=False, timeout=10)
+            limiter().wait(current_url)
+            response = session.head(current_url, headers=headers, allow_redirects=False, timeout=10)
+            status = response.status_code
             
             if response.status_code not in (301, 302, 303, 307, 308):
                 break
@@ -47,11 +294,15 @@ def resolve_redirects(url, max_redirects=10):
                 
             current_url = urljoin(current_url, location)
             redirect_count += 1
-            time.sleep(0.5)
             
         print(f"URL finale après redirections: {current_url}")
         current_url = clean_url(current_url)
         print(f"URL ckleaning après redirections: {current_url}")
+        # Mis en cache seulement si la chaîne a abouti (2xx) ou a quitté le raccourcisseur :
+        # un 429, 403 ou 5xx du raccourcisseur lui-même n'est pas une destination
+        if (status is not None and 200 <= status < 300) or urlparse(current_url).netloc.lower() != urlparse(url).netloc.lower():
+            ttl = float(config.get('redirect_cache_days', 30)) * 86400
+            http_cache().put(url, current_url, kind="HEAD", ttl=ttl)
         return current_url
         
     except Exception as e:
@@ -65,7 +316,7 @@ def is_shortener_url(url):
         'flip.it', 'bit.ly', 't.co', 'tinyurl.com', 'goo.gl', 
         'ow.ly', 'short.link', 'buff.ly', 'is.gd', 'v.gd',
         'cutt.ly', 'rebrand.ly', 'tiny.cc'
-    ]
+    ] + list(config.get('shorteners') or [])
     
     parsed = urlparse(url)
     domain = parsed.netloc.lower()
@@ -73,184 +324,166 @@ def is_shortener_url(url):
     return any(shortener in domain for shortener in shortener_domains)
 
 
-def get_article_from_source(url, mode=1, max_retries=4):
+# Empreintes de navigateur à essayer, une par mode
+MODE_HEADERS = {
+    # Requête directe avec SSL désactivé
+    1: {
+        'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36',
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
+        'Accept-Language': 'en-US,en;q=0.9',
+        'Accept-Encoding': 'gzip, deflate, br',
+        'Connection': 'keep-alive',
+    },
+    2: {
+        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36',
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
+        'Accept-Language': '*',
+        'Accept-Encoding': 'gzip;q=1.0, deflate;q=0.9, br;q=0.8, identity;q=0.7, *;q=0.1',
+        'DNT': '1',
+        'Connection': 'keep-alive',
+        'Upgrade-Insecure-Requests': '1',
+        'Sec-Fetch-Dest': 'document',
+        'Sec-Fetch-Mode': 'navigate',
+        'Sec-Fetch-Site': 'none',
+        'Sec-Fetch-User': '?1',
+        'Cache-Control': 'max-age=0',
+    },
+    3: {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+        'Accept-Language': '*',
+        'Accept-Encoding': 'gzip;q=1.0, deflate;q=0.9, br;q=0.8, identity;q=0.7, *;q=0.1',
+        'DNT': '1',
+        'Connection': 'keep-alive',
+        'Upgrade-Insecure-Requests': '1',
+    },
+    4: {
+        'User-Agent': 'Mozilla/5.0 (iPhone; CPU iPhone OS 16_5 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/16.5 Mobile/15E148 Safari/604.1',
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+        'Accept-Language': '*',
+        'Accept-Encoding': 'gzip;q=1.0, deflate;q=0.9, br;q=0.8, identity;q=0.7, *;q=0.1',
+        'Referer': 'https://www.google.com/',
+        'Connection': 'keep-alive',
+        'Upgrade-Insecure-Requests': '1',
+        'Sec-Fetch-Dest': 'document',
+        'Sec-Fetch-Mode': 'navigate',
+        'Sec-Fetch-Site': 'cross-site',
+        'Sec-Fetch-User': '?1',
+    },
+    # Navigateur plus moderne et une langue différente
+    5: {
+        'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36',
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
+        'Accept-Language': '*',
+        'Accept-Encoding': 'gzip;q=1.0, deflate;q=0.9, br;q=0.8, identity;q=0.7, *;q=0.1',
+        'Referer': 'https://www.bing.com/',
+        'Connection': 'keep-alive',
+        'Upgrade-Insecure-Requests': '1',
+        'Pragma': 'no-cache',
+    },
+}
+
+
+def fetch_with_mode(url, mode, timeout=15):
+    """Téléchargement avec l'empreinte de navigateur du mode donné (1-5)"""
+    print(f"Get Article try {mode}")
+    if mode == 1:
+        session = transport.session("insecure", verify=False)  # Désactiver la vérification SSL
+        return fetch_page(session, url, MODE_HEADERS[1], verify=False, timeout=timeout)
+    return fetch_page(transport.session(), url, MODE_HEADERS[mode], timeout=timeout)
+
+
+def fetch_with_cloudscraper(url, timeout=15):
+    """Tentative avec cloudscraper pour contourner Cloudflare"""
+    # Scraper partagé (SSL désactivé) : la session Cloudflare est réutilisée
+    return fetch_page(transport.scraper(), url, verify=False, timeout=timeout)
+
+
+def fetch_with_selenium(url, timeout=15):
     """
-    Extracteur d'article autonome avec plusieurs méthodes alternatives et une meilleure gestion des erreurs
+    Méthode alternative utilisant Selenium pour les sites avec beaucoup de JavaScript
+    ou des protections anti-scraping plus fortes
+    """
+    print(f"Selenium: {url}")
+
+    # Navigateur emprunté au pool, remis à zéro et rendu après usage
+    with driver_pool().lease() as driver:
+        limiter().wait(url)
+        html_content = driver_pool().load(driver, url, timeout)
+        final_url = driver.current_url
+    return {'status': 200, 'content': html_content, 'url': final_url or url}
+
+
+def fetch(strategy, url, timeout=None):
+    """
+    Exécute une stratégie réseau nommée : mode1..mode5, cloudscraper ou selenium.
+    Le timeout est borné par le temps restant accordé par le moteur.
+    """
+    left = timeout or float('inf')
+    if strategy == "selenium":
+        return fetch_with_selenium(url, min(left, float(config.get('selenium_timeout', 15))))
+
+    timeout = min(left, float(config.get('http_timeout', 15)))
+    if strategy.startswith("mode"):
+        return fetch_with_mode(url, int(strategy[4:]), timeout)
+    if strategy == "cloudscraper":
+        return fetch_with_cloudscraper(url, timeout)
+    raise ValueError(f"Stratégie inconnue: {strategy}")
+
+
+def get_article_from_source(url, mode=1, max_retries=4, force=False, budget=None):
+    """
+    Extracteur d'article autonome avec plusieurs méthodes alternatives et une meilleure gestion des erreurs.
+    Les stratégies réseau sont essayées dans l'ordre appris pour le domaine (voir scoreboard.py) ;
+    chaque document téléchargé passe par tous les extracteurs (voir extractors.py).
+    Les URLs et hôtes en échec récent, comme toute URL une fois le budget de la session épuisé,
+    ne sont pas tentés : le résultat est alors marqué 'deferred' et la note brute n'est pas
+    écrite (voir failures.py).
     
     Args:
         url: L'URL à extraire
         mode: Mode d'extraction initial (1-4)
         max_retries: Nombre maximum de tentatives
+        force: Ignorer le registre des échecs
+        budget: RunBudget de cet appel (une note en mode surveillance), sinon celui du moteur
     
     Returns:
         Article analysé ou dictionnaire avec informations minimales
     """
-    
+    budget = budget or engine().budget
+    if budget.exhausted():
+        return extractors.deferred_result(url, "budget de la session épuisé")
+
+    registry = failure_registry()
+    if not force:
+        reason = registry.blocked(url)
+        if reason:
+            print(f"{url}: {reason}")
+            return extractors.deferred_result(url, reason)
+
     if is_shortener_url(url):
         resolved_url = resolve_redirects(url)
         if resolved_url != url:
             url = resolved_url
+            reason = None if force else registry.blocked(url)
+            if reason:
+                print(f"{url}: {reason}")
+                return extractors.deferred_result(url, reason)
 
-    try:
-        article = Article(url)
-        
-        # Différentes empreintes de navigateur à essayer
-        if mode == 3:
-            print(f"Get Article try {mode}")
-            article.config.headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': '*',
-                'Accept-Encoding': 'gzip;q=1.0, deflate;q=0.9, br;q=0.8, identity;q=0.7, *;q=0.1',
-                'DNT': '1',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1',
-            }
-        elif mode == 2:
-            print(f"Get Article try {mode}")
-            article.config.headers = {
-                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
-                'Accept-Language': '*',
-                'Accept-Encoding': 'gzip;q=1.0, deflate;q=0.9, br;q=0.8, identity;q=0.7, *;q=0.1',
-                'DNT': '1',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1',
-                'Sec-Fetch-Dest': 'document',
-                'Sec-Fetch-Mode': 'navigate',
-                'Sec-Fetch-Site': 'none',
-                'Sec-Fetch-User': '?1',
-                'Cache-Control': 'max-age=0',
-            }
-        elif mode == 4:
-            print(f"Get Article try {mode}")
-            article.config.headers = {
-                'User-Agent': 'Mozilla/5.0 (iPhone; CPU iPhone OS 16_5 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/16.5 Mobile/15E148 Safari/604.1',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                'Accept-Language': '*',
-                'Accept-Encoding': 'gzip;q=1.0, deflate;q=0.9, br;q=0.8, identity;q=0.7, *;q=0.1',
-                'Referer': 'https://www.google.com/',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1',
-                'Sec-Fetch-Dest': 'document',
-                'Sec-Fetch-Mode': 'navigate',
-                'Sec-Fetch-Site': 'cross-site',
-                'Sec-Fetch-User': '?1',
-            }
-        elif mode == 5:
-            print(f"Get Article try {mode}")
-            # Essayer avec un navigateur plus moderne et une langue différente
-            article.config.headers = {
-                'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
-                'Accept-Language': '*',
-                'Accept-Encoding': 'gzip;q=1.0, deflate;q=0.9, br;q=0.8, identity;q=0.7, *;q=0.1',
-                'Referer': 'https://www.bing.com/',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1',
-                'Pragma': 'no-cache',
-            }
-
-        elif mode == 1:
-            print(f"Get Article try {mode}")
-            # Essayer avec requests directement avec SSL désactivé
-            try:
-                urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-                
-                session = requests.Session()
-                session.verify = False  # Désactiver la vérification SSL
-                
-                response = session.get(url, 
-                    headers={
-                        'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36',
-                        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
-                        'Accept-Language': 'en-US,en;q=0.9',
-                        'Accept-Encoding': 'gzip, deflate, br',
-                        'Connection': 'keep-alive',
-                    },
-                    timeout=15,
-                    allow_redirects=True,
-                    verify=False  # Désactiver SSL
-                )
-                
-                if response.status_code == 200:
-                    article.set_html(response.content)
-                    article.parse()
-                    
-                    result = {
-                        'title': article.title or "No Title",
-                        'text': article.text or "No Text",
-                        'canonical_link': response.url,
-                        'image': article.top_image or "",
-                        'publish': article.publish_date or ""
-                    }
-                    
-                    if result['text'] != "No Text" and len(result['text']) > 100:
-                        return result
-                        
-            except Exception as requests_error:
-                print(f"Échec avec requests direct: {requests_error}")
-                # Continuer avec newspaper3k standard
-                pass
-        
-        # Ajouter un petit délai pour éviter de ressembler à un bot
-        time.sleep(random.uniform(1, 3))
-        
-        # Tentative de téléchargement de l'article
-        article.download()
-        article.parse()
-        
-        # Extraire les informations essentielles
-        result = {
-            'title': article.title or "No Title",
-            'text': article.text or "No Text",
-            'canonical_link': article.canonical_link or url,
-            'image': article.top_image or "",
-            'publish': article.publish_date or ""
-        }
-        
-        # Ne retourner que si nous avons un contenu significatif
-        if result['text'] != "No Text" and len(result['text']) > 100:
-            return result
-        else:
-            # Si le texte est trop court, essayer une autre méthode
-            raise Exception("Contenu extrait insuffisant")
-            
-    except Exception as e:
-        print(f"Erreur d'extraction en mode {mode}: {e}")
-        
-        # Essayer des méthodes alternatives si nous n'avons pas atteint le nombre max de tentatives
-        if mode < max_retries:
-            return get_article_from_source(url, mode + 1, max_retries)
-        
-        # Si toutes les méthodes régulières échouent, essayer selenium comme solution de repli
-        try:
-            cloudscraper_result = try_cloudscraper(url)
-            if cloudscraper_result and cloudscraper_result['text'] != "No Text":
-                return cloudscraper_result
+    result = extract_with_strategies(url, mode, max_retries, budget)
+    if extractors.is_sufficient(result):
+        registry.record_success(url)
+    elif not extractors.is_deferred(result):
+        registry.record_failure(url, result.get('reason') or "contenu insuffisant", is_network_failure(result))
+    return result
+
+
+def extract_with_strategies(url, mode, max_retries, budget=None):
+    """Cascade des stratégies réseau pour une URL déjà résolue (voir engine.py)"""
+    strategies = [f"mode{m}" for m in range(mode, max_retries + 1)] + ["cloudscraper", "selenium"]
+    disabled = config.get('disabled_strategies') or []
+    return engine().run(url, [s for s in strategies if s not in disabled], budget)
 
-            return get_article_with_selenium(url)
-        except Exception as selenium_error:
-            print(f"Échec de la solution de repli Selenium: {selenium_error}")
-            
-            # Essayer d'extraire l'URL pertinente s'il y a une redirection
-            error_url = extract_first_url(str(e))
-            if error_url and error_url != url:
-                print(f"URL de redirection trouvée: {error_url}")
-                try:
-                    # Essayer une fois de plus avec l'URL d'erreur
-                    return get_article_from_source(error_url, 1, 2)
-                except:
-                    pass
-            
-            # Retourner des informations minimales en dernier recours
-            return {
-                'title': "No Title",
-                'text': "No Text",
-                'canonical_link': error_url or url,
-                'image': "",
-                'publish': ""
-            }
 
 def clean_url(url: str) -> str:
     """
@@ -295,6 +528,10 @@ def get_article_with_seleniumOld(url):
     Méthode alternative utilisant Selenium pour les sites avec beaucoup de JavaScript
     ou des protections anti-scraping plus fortes
     """
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.common.by import By
+
     try:
         
         print(f"Selenium: {url}")
@@ -330,243 +567,18 @@ def get_article_with_seleniumOld(url):
         # Obtenir le code source de la page après l'exécution de JavaScript
         html_content = driver.page_source
         
-        # Analyser avec BeautifulSoup
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
-        # Extraire le titre
-        title = soup.title.text if soup.title else "No Title"
-        
-        # Extraction de contenu de base - cibler le contenu de l'article
-        # Ajuster ces sélecteurs en fonction de la structure spécifique du site
-        article_selectors = [
-            "article", 
-            ".article-content", 
-            ".entry-content",
-            ".post-content",
-            "main",
-            "#content"
-        ]
-        
-        article_content = None
-        for selector in article_selectors:
-            content = soup.select_one(selector)
-            if content and len(content.text.strip()) > 200:
-                article_content = content
-                break
-        
-        text = article_content.text.strip() if article_content else "No Text"
-        
-        # Extraire l'image principale
-        image = ""
-        img_tag = soup.select_one("article img, .article-content img, .featured-image img")
-        if img_tag and img_tag.get('src'):
-            image = img_tag['src']
-            # Convertir les URL relatives en absolues
-            if image.startswith('/'):
-                from urllib.parse import urlparse
-                parsed_url = urlparse(url)
-                image = f"{parsed_url.scheme}://{parsed_url.netloc}{image}"
-                
-        # Fermer le navigateur
-        driver.quit()
-        
-        return {
-            'title': title,
-            'text': text,
-            'canonical_link': url,
-            'image': image,
-            'publish': ""  # L'extraction de date est plus complexe et spécifique au site
-        }
-        
-    except Exception as e:
-        print(f"Échec de l'extraction avec Selenium: {e}")
-        raise e
+        # Analyse en un seul parcours (lxml, BeautifulSoup en repli)
+        result = extractors.selector_extract(html_content, url)
 
-def extract_first_url(text):
-    """Extraire la première URL du texte, amélioré pour gérer plus de formats d'URL"""
-    
-    # Motif de reconnaissance d'URL amélioré
-    url_pattern = r'https?://(?:[-\w.]|(?:%[\da-fA-F]{2}))+'
-    urls = re.findall(url_pattern, text)
-    
-    if urls:
-        # Nettoyer l'URL - supprimer la ponctuation finale ou les guillemets
-        url = urls[0].rstrip('.,;:\'\"')
-        return url
-    
-    return None
-
-def try_cloudscraper(url):
-    """Tentative avec cloudscraper pour contourner Cloudflare"""
-    try:
-        # import cloudscraper
-        # import ssl
-        
-        # Créer un contexte SSL qui ignore la vérification
-        ssl_context = ssl.create_default_context()
-        ssl_context.check_hostname = False
-        ssl_context.verify_mode = ssl.CERT_NONE
-        
-        # Créer le scraper avec des options SSL désactivées
-        scraper = cloudscraper.create_scraper(
-            ssl_context=ssl_context,
-            browser={
-                'browser': 'chrome',
-                'platform': 'windows',
-                'desktop': True
-            }
-        )
-        
-        # Désactiver les warnings SSL
-        # import urllib3
-        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-        
-        response = scraper.get(url, timeout=15, verify=False)
-        
-        if response.status_code == 200:
-            article = Article('')
-            article.set_html(response.content)
-            article.parse()
-            
-            result = {
-                'title': article.title or "No Title",
-                'text': article.text or "No Text", 
-                'canonical_link': url,
-                'image': article.top_image or "",
-                'publish': article.publish_date or ""
-            }
-            
-            # Vérifier si on a du contenu utile
-            if result['text'] != "No Text" and len(result['text']) > 100:
-                print(f"Cloudscraper réussi: {len(result['text'])} caractères")
-                return result
-                
-    except Exception as e:
-        print(f"Cloudscraper a échoué: {e}")
-        return None
-
-def get_article_with_selenium(url):
-    """
-    Méthode alternative utilisant Selenium pour les sites avec beaucoup de JavaScript
-    ou des protections anti-scraping plus fortes - utilise Article pour l'extraction
-    """
-    try:
-        print(f"Selenium: {url}")
-        
-        # Configurer le navigateur headless
-        options = Options()
-        options.add_argument('--headless')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--window-size=1920,1080')
-        options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36")
-        
-        # Initialiser le driver
-        driver = webdriver.Chrome(options=options)
-        
-        # Ajouter l'automatisation du consentement aux cookies
-        driver.get(url)
-        time.sleep(5)  # Attendre que la page se charge complètement
-        
-        # Essayer de gérer les modèles courants de consentement aux cookies
-        try:
-            consent_buttons = driver.find_elements(By.XPATH, 
-                "//button[contains(text(), 'Accept') or contains(text(), 'I agree') or contains(text(), 'Agree') or contains(text(), 'Accept All') or contains(@id, 'accept') or contains(@class, 'accept')]")
-            
-            if consent_buttons:
-                consent_buttons[0].click()
-                time.sleep(2)  # Attendre que les cookies soient acceptés
-        except:
-            pass
-        
-        # Obtenir le code source de la page après l'exécution de JavaScript
-        html_content = driver.page_source
-        
-        # Fermer le navigateur maintenant qu'on a le HTML
+        # Fermer le navigateur
         driver.quit()
         
-        # Utiliser Article pour parser le contenu récupéré par Selenium
-        article = Article(url)
-        article.set_html(html_content)
-        article.parse()
-        
-        # Extraire les informations avec Article
-        result = {
-            'title': article.title or "No Title",
-            'text': article.text or "No Text",
-            'canonical_link': article.canonical_link or url,
-            'image': article.top_image or "",
-            'publish': article.publish_date or ""
-        }
-        
-        # Vérifier si le contenu extrait est suffisant
-        if result['text'] != "No Text" and len(result['text']) > 100:
-            print(f"Selenium + Article réussi: {len(result['text'])} caractères")
-            return result
-        else:
-            # Si Article n'a pas bien extrait, faire un fallback manuel
-            print("Article n'a pas bien extrait, fallback manuel...")
-            return selenium_manual_fallback(html_content, url)
+        return result
         
     except Exception as e:
         print(f"Échec de l'extraction avec Selenium: {e}")
-        try:
-            driver.quit()
-        except:
-            pass
         raise e
 
-def selenium_manual_fallback(html_content, url):
-    """Fallback manuel si Article ne fonctionne pas avec le HTML de Selenium"""
-    from urllib.parse import urlparse
-    
-    soup = BeautifulSoup(html_content, 'html.parser')
-    
-    # Extraire le titre
-    title_selectors = ['h1', 'title', '.article-title', '.entry-title', '.post-title']
-    title = "No Title"
-    for selector in title_selectors:
-        title_elem = soup.select_one(selector)
-        if title_elem and title_elem.text.strip():
-            title = title_elem.text.strip()
-            break
-    
-    # Extraction de contenu
-    article_selectors = [
-        "article", 
-        ".article-content", 
-        ".entry-content",
-        ".post-content",
-        "main",
-        "#content"
-    ]
-    
-    text = "No Text"
-    for selector in article_selectors:
-        content = soup.select_one(selector)
-        if content and len(content.text.strip()) > 200:
-            text = content.text.strip()
-            break
-    
-    # Extraire l'image principale
-    image = ""
-    img_tag = soup.select_one("article img, .article-content img, .featured-image img")
-    if img_tag and img_tag.get('src'):
-        image = img_tag['src']
-        # Convertir les URL relatives en absolues
-        if image.startswith('/'):
-            parsed_url = urlparse(url)
-            image = f"{parsed_url.scheme}://{parsed_url.netloc}{image}"
-    
-    return {
-        'title': title,
-        'text': text,
-        'canonical_link': url,
-        'image': image,
-        'publish': ""
-    }
-
 # Exemple d'utilisation
 if __name__ == "__main__":
     test_url = "https://www.joanwestenberg.com/p/why-stories-make-you-smarter-than-self-help-books?utm_source=flipboard&utm_content=other"
@@ -0,0 +1,153 @@
+"""Pool de navigateurs Chrome headless réutilisables pour le fallback Selenium"""
+
+import queue
+import threading
+from contextlib import contextmanager
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import (
+    TimeoutException, WebDriverException, InvalidSessionIdException, NoSuchWindowException
+)
+
+CONSENT_XPATH = "//button[contains(text(), 'Accept') or contains(text(), 'I agree') or contains(text(), 'Agree') or contains(text(), 'Accept All') or contains(@id, 'accept') or contains(@class, 'accept')]"
+
+
+# Messages de chromedriver quand le navigateur lui-même est perdu
+DEAD_SESSION = ('invalid session id', 'session deleted', 'chrome not reachable', 'disconnected', 'no such window')
+
+
+def is_dead_session(error):
+    """Le navigateur a planté ou été fermé (par opposition à une page lente ou en erreur)"""
+    if isinstance(error, (InvalidSessionIdException, NoSuchWindowException)):
+        return True
+    if isinstance(error, TimeoutException) or not isinstance(error, WebDriverException):
+        return False
+    return any(marker in (error.msg or "").lower() for marker in DEAD_SESSION)
+
+
+def new_driver():
+    """Crée un Chrome headless"""
+    options = Options()
+    options.add_argument('--headless')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--disable-gpu')
+    options.add_argument('--window-size=1920,1080')
+    options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36")
+    # Ne pas attendre les sous-ressources : la disponibilité est testée explicitement
+    options.page_load_strategy = 'eager'
+    return webdriver.Chrome(options=options)
+
+
+class DriverPool:
+
+    def __init__(self, size=2, timeout=15):
+        """
+        Args:
+            size: Nombre maximum de navigateurs ouverts simultanément
+            timeout: Délai maximum (s) d'attente de chargement d'une page
+        """
+        self.size = size
+        self.timeout = timeout
+        self.idle = queue.LifoQueue()
+        self.slots = threading.Semaphore(size)
+        self.lock = threading.Lock()
+        self.drivers = set()
+
+    @contextmanager
+    def lease(self):
+        """Prête un navigateur pour une URL ; il n'est recyclé que si sa session est morte"""
+        self.slots.acquire()
+        try:
+            try:
+                driver = self.idle.get_nowait()
+            except queue.Empty:
+                driver = new_driver()
+                driver.set_page_load_timeout(self.timeout)
+                with self.lock:
+                    self.drivers.add(driver)
+            try:
+                yield driver
+            except Exception as e:
+                if is_dead_session(e):
+                    self.discard(driver)
+                else:
+                    # Page lente ou en erreur : le navigateur reste bon, pas de nouveau lancement de Chrome
+                    self.release(driver)
+                raise
+            self.release(driver)
+        finally:
+            self.slots.release()
+
+    def release(self, driver):
+        """Remet le navigateur dans le pool, ou le ferme s'il ne peut plus être remis à zéro (sans lever)"""
+        try:
+            self.reset(driver)
+        except Exception as e:
+            print(f"Selenium: navigateur fermé ({e.__class__.__name__})")
+            self.discard(driver)
+        else:
+            self.idle.put(driver)
+
+    def reset(self, driver):
+        """Efface l'état laissé par la page précédente"""
+        driver.delete_all_cookies()
+        try:
+            driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        except WebDriverException as e:
+            if is_dead_session(e):
+                raise
+        driver.get("about:blank")
+
+    def discard(self, driver):
+        with self.lock:
+            self.drivers.discard(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def load(self, driver, url, timeout=None):
+        """Charge une page, attend qu'elle soit prête et accepte les cookies si besoin"""
+        timeout = min(timeout or self.timeout, self.timeout)
+        driver.set_page_load_timeout(timeout)
+        try:
+            driver.get(url)
+        except TimeoutException:
+            # Page partiellement chargée : on travaille avec ce qui est là
+            print(f"Selenium: délai de chargement dépassé pour {url}")
+        wait = WebDriverWait(driver, timeout)
+        try:
+            wait.until(lambda d: d.execute_script("return document.readyState") in ("interactive", "complete"))
+        except TimeoutException:
+            # Page lente, pas un navigateur planté : on garde ce qui est déjà chargé
+            print(f"Selenium: page toujours en chargement pour {url}")
+
+        # Essayer de gérer les modèles courants de consentement aux cookies
+        try:
+            consent_buttons = driver.find_elements(By.XPATH, CONSENT_XPATH)
+            if consent_buttons:
+                consent_buttons[0].click()
+                WebDriverWait(driver, 2).until(EC.staleness_of(consent_buttons[0]))
+        except Exception:
+            pass
+
+        try:
+            wait.until(lambda d: d.execute_script("return document.readyState") == "complete")
+        except TimeoutException:
+            pass
+        return driver.page_source
+
+    def close(self):
+        with self.lock:
+            drivers = list(self.drivers)
+            self.drivers.clear()
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
@@ -0,0 +1,83 @@
+"""Index trié et persistant des dates de bookmarks : une fenêtre de dates se lit par bisection"""
+
+import os, json
+import threading
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime, timezone
+
+
+class DateIndex:
+
+    def __init__(self, path):
+        """
+        Args:
+            path: Fichier JSON de persistance
+        """
+        self.path = path
+        self.lock = threading.Lock()
+        self.entries, self.files = self.load()
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                entries = [tuple(e) for e in json.load(f)]
+        except Exception:
+            entries = []
+        entries.sort()
+        return entries, {file: ts for ts, file in entries}
+
+    def save(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f)
+        os.replace(tmp, self.path)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def discard(self, file):
+        ts = self.files.pop(file, None)
+        if ts is not None:
+            i = bisect_left(self.entries, (ts, file))
+            if i < len(self.entries) and self.entries[i] == (ts, file):
+                del self.entries[i]
+
+    def update(self, dates, removed=(), save=True):
+        """
+        Args:
+            dates: {fichier: datetime ou None (retire la note)}
+            removed: Notes supprimées du coffre
+        """
+        with self.lock:
+            for file in removed:
+                self.discard(file)
+            for file, date in dates.items():
+                self.discard(file)
+                if date is not None:
+                    ts = date.timestamp()
+                    insort(self.entries, (ts, file))
+                    self.files[file] = ts
+            if save:
+                self.save()
+
+    def rebuild(self, dates):
+        """Reconstruit l'index complet ({fichier: datetime})"""
+        with self.lock:
+            self.entries = sorted((date.timestamp(), file) for file, date in dates.items() if date is not None)
+            self.files = {file: ts for ts, file in self.entries}
+            self.save()
+
+    def between(self, start_date, end_date):
+        """Notes datées dans [start_date, end_date], de la plus récente à la plus ancienne"""
+        with self.lock:
+            lo = bisect_left(self.entries, (start_date.timestamp(), ""))
+            hi = bisect_right(self.entries, (end_date.timestamp(), "\uffff"))
+            window = self.entries[lo:hi]
+        return [(file, datetime.fromtimestamp(ts, tz=timezone.utc)) for ts, file in reversed(window)]
+
+
+def from_config(config):
+    """Index paramétré par _param.yml (fichier par défaut : _cache/dates.json)"""
+    import tools
+
+    return DateIndex(config.get('date_index_file') or os.path.join(tools.cache_dir(), "dates.json"))
@@ -0,0 +1,130 @@
+"""Moteur itératif de tentatives d'extraction, borné par un délai par URL et un budget global"""
+
+import time
+import threading
+from collections import deque
+from urllib.parse import urlparse
+
+import extractors
+
+
+class NotAnArticle(Exception):
+    """Le corps téléchargé n'est pas du HTML (PDF, vidéo...) : inutile d'essayer d'autres stratégies"""
+
+
+def is_network_failure(result):
+    """Échec dû au réseau ou au serveur (exceptions, statut HTTP) : ni contenu non HTML, ni page maigre, ni délai"""
+    attempts = (result or {}).get('attempts') or []
+    return (bool(attempts) and all(a.get('outcome') == "error" for a in attempts)
+            and result.get('reason') != "délai dépassé")
+
+
+class RunBudget:
+    """Temps total alloué à une session (papers.py, news.py), partagé entre threads"""
+
+    def __init__(self, seconds=None):
+        self.seconds = seconds
+        self.start = time.monotonic()
+        self.lock = threading.Lock()
+
+    def remaining(self):
+        if not self.seconds:
+            return float('inf')
+        with self.lock:
+            return self.seconds - (time.monotonic() - self.start)
+
+    def exhausted(self):
+        return self.remaining() <= 0
+
+
+class ExtractionEngine:
+
+    def __init__(self, fetch, board, url_deadline=90, budget=None, extract=None):
+        """
+        Args:
+            fetch: fetch(stratégie, url, timeout) -> page {'content', 'url', ...}
+            board: StrategyBoard donnant l'ordre des stratégies par hôte
+            url_deadline: Temps maximum (s) consacré à une URL
+            budget: RunBudget commun à toute la session
+            extract: extract(html, url, timeout) -> résultat, timeout = temps restant pour l'URL
+                     (par défaut extractors.extract, dans le thread courant)
+        """
+        self.fetch = fetch
+        self.board = board
+        self.url_deadline = url_deadline
+        self.budget = budget or RunBudget()
+        self.extract = extract or (lambda html_content, url, timeout: extractors.extract(html_content, url))
+
+    @staticmethod
+    def host(url):
+        return urlparse(url).netloc.lower()
+
+    def plan(self, url, strategies):
+        return deque((url, strategy) for strategy in self.board.order(self.host(url), strategies))
+
+    def run(self, url, strategies, budget=None):
+        """
+        Essaie les stratégies une à une jusqu'au succès, à l'expiration du délai ou du budget.
+
+        Args:
+            budget: RunBudget propre à cet appel (mode surveillance), sinon celui du moteur
+
+        Returns:
+            Le résultat (suffisant ou meilleur partiel), avec la liste des tentatives dans 'attempts'
+        """
+        budget = budget or self.budget
+        deadline = time.monotonic() + self.url_deadline
+        queue = self.plan(url, strategies)
+        attempts = []
+        best = None
+        reason = "toutes les stratégies ont échoué"
+
+        while queue:
+            left = min(deadline - time.monotonic(), budget.remaining())
+            if left <= 0:
+                reason = "budget de la session épuisé" if budget.exhausted() else "délai dépassé"
+                print(f"{reason.capitalize()}: {url}")
+                break
+
+            target, strategy = queue.popleft()
+            start = time.monotonic()
+            attempt = {'strategy': strategy, 'url': target}
+            attempts.append(attempt)
+            try:
+                page = self.fetch(strategy, target, left)
+            except NotAnArticle as e:
+                # Même corps quelle que soit la stratégie : on s'arrête là
+                print(f"Pas un article ({e}): {target}")
+                attempt.update(duration=time.monotonic() - start, outcome="not-article")
+                reason = str(e)
+                break
+            except Exception as e:
+                print(f"Erreur de téléchargement ({strategy}): {e}")
+                attempt.update(duration=time.monotonic() - start, outcome="error", error=str(e))
+                self.board.record(self.host(target), strategy, False, attempt['duration'])
+            else:
+                # Le document obtenu passe par tous les extracteurs avant de retenter le réseau
+                # Au moins une seconde pour une page arrivée juste avant l'échéance
+                left = max(1.0, min(deadline - time.monotonic(), budget.remaining()))
+                result = self.extract(page['content'], page['url'], left)
+                success = extractors.is_sufficient(result)
+                attempt.update(duration=time.monotonic() - start, outcome="ok" if success else "insufficient")
+                self.board.record(self.host(target), strategy, success, attempt['duration'])
+                if success:
+                    return dict(result, attempts=attempts)
+                print(f"Contenu extrait insuffisant ({strategy})")
+                if result and (not best or len(result['text']) > len(best['text'])):
+                    best = result
+
+        self.summary(url, attempts)
+        if budget.exhausted():
+            # URL pas vraiment tentée : reportée au prochain passage plutôt qu'enregistrée vide
+            return dict(extractors.deferred_result(url, "budget de la session épuisé"), attempts=attempts)
+        if best:
+            return dict(best, attempts=attempts)
+        return dict(extractors.empty_result(url, reason), attempts=attempts)
+
+    def summary(self, url, attempts):
+        total = sum(a.get('duration', 0) for a in attempts)
+        steps = ", ".join(f"{a['strategy']}:{a.get('outcome')}:{a.get('duration', 0):.1f}s" for a in attempts)
+        print(f"Échec {url} en {total:.1f}s [{steps}]")
@@ -0,0 +1,101 @@
+"""Extracteurs de contenu : un HTML déjà téléchargé passe par chacun avant de retenter le réseau"""
+
+from urllib.parse import urlparse
+
+import htmltree
+
+
+def is_sufficient(result):
+    """Un résultat n'est retenu que s'il contient un texte significatif"""
+    return bool(result) and result['text'] != "No Text" and len(result['text']) > 100
+
+
+def empty_result(url, reason=""):
+    """Informations minimales quand aucun contenu n'a pu être extrait"""
+    return {
+        'title': "No Title",
+        'text': "No Text",
+        'canonical_link': url,
+        'image': "",
+        'publish': "",
+        'reason': reason
+    }
+
+
+def deferred_result(url, reason=""):
+    """URL non tentée (échec récent) : la note brute est gardée pour un prochain passage"""
+    return dict(empty_result(url, reason), deferred=True)
+
+
+def is_deferred(result):
+    return isinstance(result, dict) and bool(result.get('deferred'))
+
+
+def newspaper_extract(html_content, url):
+    """Extraction newspaper3k (Article.parse) sur un HTML fourni"""
+    from newspaper import Article  # import lourd (nltk) : seulement au premier article
+
+    article = Article(url)
+    article.set_html(html_content)
+    article.parse()
+
+    return {
+        'title': article.title or "No Title",
+        'text': article.text or "No Text",
+        'canonical_link': article.canonical_link or url,
+        'image': article.top_image or "",
+        'publish': article.publish_date or ""
+    }
+
+
+def selector_extract(html_content, url):
+    """Fallback manuel par sélecteurs CSS si Article ne fonctionne pas (backend de htmltree)"""
+    title, text, image = htmltree.manual_fields(html_content)
+
+    # Convertir les URL relatives en absolues
+    if image.startswith('/'):
+        parsed_url = urlparse(url)
+        image = f"{parsed_url.scheme}://{parsed_url.netloc}{image}"
+
+    return {
+        'title': title or "No Title",
+        'text': text or "No Text",
+        'canonical_link': url,
+        'image': image,
+        'publish': ""
+    }
+
+
+# Extracteurs essayés dans l'ordre sur chaque document téléchargé
+EXTRACTORS = [
+    ('newspaper', newspaper_extract),
+    ('selectors', selector_extract),
+]
+
+
+def extract(html_content, url):
+    """
+    Passe un même HTML dans chaque extracteur.
+
+    Returns:
+        Le premier résultat suffisant, sinon le résultat partiel au texte le plus long (ou None)
+    """
+    # Décodé une fois pour tous les extracteurs (bytes du cache ou des fixtures)
+    html_content = htmltree.decode_html(html_content)
+    best = None
+    for name, extractor in EXTRACTORS:
+        try:
+            result = extractor(html_content, url)
+        except Exception as e:
+            print(f"Extracteur {name} en échec: {e}")
+            continue
+
+        if is_sufficient(result):
+            print(f"Extraction {name} réussie: {len(result['text'])} caractères")
+            return result
+
+        if result['text'] != "No Text" and (best is None or len(result['text']) > len(best['text'])):
+            best = result
+        elif best is None and result['title'] != "No Title":
+            best = result
+    return best
@@ -0,0 +1,144 @@
+"""Registre persistant des URLs et hôtes en échec, avec backoff exponentiel
+
+python3 src/failures.py list
+python3 src/failures.py retry <url|hôte>   # force un nouvel essai
+python3 src/failures.py clear              # vide le registre
+"""
+
+import os, sys, json, time
+import threading
+from datetime import datetime
+from urllib.parse import urlparse
+
+
+class FailureRegistry:
+
+    def __init__(self, path, backoff_hours=1, max_days=30, ttl_days=90, host_after=3):
+        """
+        Args:
+            path: Fichier JSON de persistance
+            backoff_hours: Délai avant le premier nouvel essai, doublé à chaque échec
+            max_days: Délai maximum entre deux essais
+            ttl_days: Un échec plus ancien est oublié
+            host_after: Échecs consécutifs (toutes URLs confondues) avant de bloquer l'hôte
+        """
+        self.path = path
+        self.base = backoff_hours * 3600
+        self.max_delay = max_days * 86400
+        self.ttl = ttl_days * 86400
+        self.host_after = host_after
+        self.lock = threading.Lock()
+        self.data = self.load()
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception:
+            data = {}
+        data.setdefault('urls', {})
+        data.setdefault('hosts', {})
+        return data
+
+    def save(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, indent=1, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+    @staticmethod
+    def host(url):
+        return urlparse(url).netloc.lower()
+
+    def purge(self, now):
+        """Oublie les échecs plus vieux que le TTL"""
+        for table in (self.data['urls'], self.data['hosts']):
+            for key in [k for k, e in table.items() if now - e['last'] > self.ttl]:
+                del table[key]
+
+    def blocked(self, url):
+        """Retourne la raison du blocage si l'URL ou son hôte est en backoff, sinon None"""
+        now = time.time()
+        with self.lock:
+            self.purge(now)
+            for key, table in ((url, self.data['urls']), (self.host(url), self.data['hosts'])):
+                entry = table.get(key)
+                if entry and entry.get('retry', 0) > now:
+                    until = datetime.fromtimestamp(entry['retry']).strftime("%Y-%m-%d %H:%M")
+                    return f"échec connu ({entry['reason']}), nouvel essai après {until}"
+        return None
+
+    def delay(self, count):
+        return min(self.base * 2 ** (count - 1), self.max_delay)
+
+    def record_failure(self, url, reason="", host=True):
+        """
+        Args:
+            host: L'échec compte aussi pour l'hôte (erreurs réseau ou HTTP seulement :
+                  un PDF ou une page maigre ne disent rien de la disponibilité du site)
+        """
+        now = time.time()
+        with self.lock:
+            entry = self.data['urls'].setdefault(url, {'count': 0})
+            entry['count'] += 1
+            entry.update(last=now, retry=now + self.delay(entry['count']), reason=reason)
+
+            if host:
+                entry = self.data['hosts'].setdefault(self.host(url), {'count': 0})
+                entry['count'] += 1
+                entry.update(last=now, reason=reason)
+                if entry['count'] >= self.host_after:
+                    entry['retry'] = now + self.delay(entry['count'] - self.host_after + 1)
+            self.save()
+
+    def record_success(self, url):
+        with self.lock:
+            changed = self.data['urls'].pop(url, None) is not None
+            changed = self.data['hosts'].pop(self.host(url), None) is not None or changed
+            if changed:
+                self.save()
+
+    def clear(self, key=None):
+        """Force un nouvel essai pour une URL ou un hôte (tout le registre si key est None)"""
+        with self.lock:
+            if key is None:
+                self.data = {'urls': {}, 'hosts': {}}
+                removed = True
+            else:
+                removed = self.data['urls'].pop(key, None) is not None
+                host = self.host(key) or key.lower()
+                removed = self.data['hosts'].pop(host, None) is not None or removed
+            self.save()
+            return removed
+
+
+def from_config(config):
+    """Registre paramétré par _param.yml (fichier par défaut : _cache/failures.json)"""
+    import tools
+
+    return FailureRegistry(
+        config.get('failures_file') or os.path.join(tools.cache_dir(), "failures.json"),
+        float(config.get('failure_backoff_hours', 1)),
+        float(config.get('failure_max_days', 30)),
+        float(config.get('failure_ttl_days', 90)),
+        int(config.get('failure_host_after', 3))
+    )
+
+
+if __name__ == '__main__':
+    import tools
+
+    registry = from_config(tools.site_yml('_param.yml'))
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "list"
+    if command == "retry" and len(sys.argv) > 2:
+        for key in sys.argv[2:]:
+            print(key, "débloqué" if registry.clear(key) else "absent du registre")
+    elif command == "clear":
+        registry.clear()
+        print("Registre vidé")
+    else:
+        for table in ('urls', 'hosts'):
+            for key, entry in sorted(registry.data[table].items(), key=lambda item: item[1]['last']):
+                retry = datetime.fromtimestamp(entry.get('retry', entry['last'])).strftime("%Y-%m-%d %H:%M")
+                print(f"{key}  x{entry['count']}  -> {retry}  {entry['reason']}")
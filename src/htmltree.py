@@ -0,0 +1,180 @@
+"""Parsing HTML rapide : backend lxml par défaut, BeautifulSoup ('html.parser') en repli
+
+Les sélecteurs du fallback manuel sont compilés une fois en prédicats (balise, classe, id)
+et évalués en un seul parcours de l'arbre.
+"""
+
+import re
+import codecs
+import importlib.util
+
+# lxml n'est importé qu'au premier parsing (démarrage rapide)
+HAVE_LXML = importlib.util.find_spec('lxml') is not None
+
+BACKEND = 'lxml' if HAVE_LXML else 'bs4'
+
+TITLE_SELECTORS = ['h1', 'title', '.article-title', '.entry-title', '.post-title']
+ARTICLE_SELECTORS = ["article", ".article-content", ".entry-content", ".post-content", "main", "#content"]
+# Conteneurs dont la première image est l'image principale (« article img, ... »)
+IMAGE_CONTAINERS = ["article", ".article-content", ".featured-image"]
+
+
+def set_backend(name):
+    """Choisit le backend ('lxml' ou 'bs4') ; lxml absent -> bs4"""
+    global BACKEND
+    BACKEND = 'lxml' if name == 'lxml' and HAVE_LXML else 'bs4'
+    return BACKEND
+
+
+CHARSET_HEADER = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.I)
+CHARSET_META = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?([\w.:-]+)', re.I)
+BOMS = ((codecs.BOM_UTF8, 'utf-8-sig'), (codecs.BOM_UTF16_LE, 'utf-16'), (codecs.BOM_UTF16_BE, 'utf-16'))
+
+
+def decode_html(body, content_type=None):
+    """
+    Corps HTML en str : BOM, charset de l'en-tête Content-Type, <meta charset>, UTF-8, puis cp1252.
+    (lxml lit des bytes sans <meta charset> en Latin-1 : « Café » devenait « CafÃ© ».)
+    """
+    if isinstance(body, str):
+        return body
+    candidates = [encoding for bom, encoding in BOMS if body.startswith(bom)]
+    match = CHARSET_HEADER.search(content_type or "")
+    if match:
+        candidates.append(match.group(1))
+    match = CHARSET_META.search(body[:4096])
+    if match:
+        candidates.append(match.group(1).decode('ascii', 'ignore'))
+    candidates.append('utf-8')
+    for encoding in candidates:
+        try:
+            # final=False : un caractère coupé par le plafond max_page_mb n'invalide pas la page
+            return codecs.getincrementaldecoder(encoding)().decode(body, final=False)
+        except (LookupError, UnicodeDecodeError):
+            continue
+    return body.decode('cp1252', errors='replace')
+
+
+def compile_selector(selector):
+    """Sélecteur simple (balise, .classe ou #id) -> prédicat(tag, classes, id)"""
+    if selector.startswith('.'):
+        name = selector[1:]
+        return lambda tag, classes, ident: name in classes
+    if selector.startswith('#'):
+        name = selector[1:]
+        return lambda tag, classes, ident: ident == name
+    return lambda tag, classes, ident: tag == selector
+
+
+TITLE_MATCHERS = [compile_selector(s) for s in TITLE_SELECTORS]
+ARTICLE_MATCHERS = [compile_selector(s) for s in ARTICLE_SELECTORS]
+IMAGE_MATCHERS = [compile_selector(s) for s in IMAGE_CONTAINERS]
+
+
+def parse_document(html_content):
+    """Arbre lxml d'un document complet (bytes décodés par decode_html, ou str)"""
+    import lxml.html
+
+    html_content = decode_html(html_content)
+    try:
+        return lxml.html.document_fromstring(html_content)
+    except ValueError:
+        # str avec déclaration d'encodage XML : lxml exige des bytes, lus en UTF-8
+        parser = lxml.html.HTMLParser(encoding='utf-8')
+        return lxml.html.document_fromstring(html_content.encode('utf-8'), parser=parser)
+
+
+def scan_lxml(html_content):
+    """
+    Un seul parcours (iterwalk) : premier élément de chaque sélecteur de titre et de contenu,
+    première image située dans un conteneur d'article.
+    """
+    from lxml import etree
+
+    try:
+        root = parse_document(html_content)
+    except (etree.ParserError, etree.XMLSyntaxError):
+        return [None] * len(TITLE_MATCHERS), [None] * len(ARTICLE_MATCHERS), None
+
+    titles = [None] * len(TITLE_MATCHERS)
+    contents = [None] * len(ARTICLE_MATCHERS)
+    image = None
+    open_containers = []
+
+    for event, el in etree.iterwalk(root, events=('start', 'end')):
+        if not isinstance(el.tag, str):
+            continue
+        if event == 'end':
+            if open_containers and open_containers[-1] is el:
+                open_containers.pop()
+            continue
+
+        tag = el.tag
+        classes = (el.get('class') or '').split()
+        ident = el.get('id')
+
+        for i, match in enumerate(TITLE_MATCHERS):
+            if titles[i] is None and match(tag, classes, ident):
+                titles[i] = el
+        for i, match in enumerate(ARTICLE_MATCHERS):
+            if contents[i] is None and match(tag, classes, ident):
+                contents[i] = el
+        if image is None:
+            if tag == 'img' and open_containers:
+                image = el
+            elif any(match(tag, classes, ident) for match in IMAGE_MATCHERS):
+                open_containers.append(el)
+
+    return titles, contents, image
+
+
+def manual_fields(html_content):
+    """
+    Titre, texte et image selon les heuristiques du fallback manuel.
+
+    Returns:
+        (titre ou None, texte ou None, src de l'image ou "")
+    """
+    if BACKEND == 'lxml':
+        titles, contents, img = scan_lxml(html_content)
+        title_texts = [el.text_content().strip() if el is not None else "" for el in titles]
+        content_texts = [el.text_content().strip() if el is not None else "" for el in contents]
+        src = img.get('src') if img is not None else ""
+    else:
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(decode_html(html_content), 'html.parser')
+        title_texts = []
+        for selector in TITLE_SELECTORS:
+            el = soup.select_one(selector)
+            title_texts.append(el.text.strip() if el else "")
+        content_texts = []
+        for selector in ARTICLE_SELECTORS:
+            el = soup.select_one(selector)
+            content_texts.append(el.text.strip() if el else "")
+        img = soup.select_one(", ".join(f"{c} img" for c in IMAGE_CONTAINERS))
+        src = img.get('src') if img else ""
+
+    title = next((t for t in title_texts if t), None)
+    text = next((t for t in content_texts if len(t) > 200), None)
+    return title, text, src or ""
+
+
+def text_and_links(html_content):
+    """Texte brut et liens (href) d'un fragment HTML, p. ex. le contenu d'un toot"""
+    if not html_content:
+        return "", []
+    if BACKEND == 'lxml':
+        import lxml.html
+        from lxml import etree
+
+        try:
+            root = lxml.html.fragment_fromstring(html_content, create_parent='div')
+        except (etree.ParserError, etree.XMLSyntaxError):
+            return "", []
+        return root.text_content(), [a.get('href') for a in root.iter('a') if a.get('href')]
+
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(decode_html(html_content), 'html.parser')
+    return soup.get_text(), [a['href'] for a in soup.find_all('a', href=True)]
@@ -0,0 +1,138 @@
+"""Cache disque des réponses HTTP avec revalidation conditionnelle (ETag / Last-Modified)"""
+
+import os, json, time
+import hashlib
+import threading
+from urllib.parse import urlparse, urlunparse
+
+
+def normalize_url(url):
+    """Clé de cache : schéma et hôte en minuscules, sans fragment."""
+    try:
+        parsed = urlparse(url.strip())
+        return urlunparse(parsed._replace(
+            scheme=parsed.scheme.lower(),
+            netloc=parsed.netloc.lower(),
+            path=parsed.path or "/",
+            fragment=""
+        ))
+    except Exception:
+        return url
+
+
+class HttpCache:
+
+    def __init__(self, cache_dir, max_bytes=200 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(cache_dir, "index.json")
+        self.lock = threading.Lock()
+        self.dirty = False
+        os.makedirs(cache_dir, exist_ok=True)
+        self.index = self.load_index()
+
+    def load_index(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
+    def save_index(self):
+        tmp = self.index_path + ".tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f)
+        os.replace(tmp, self.index_path)
+        self.dirty = False
+
+    def key(self, url, kind="GET"):
+        return hashlib.sha1(f"{kind} {normalize_url(url)}".encode('utf-8')).hexdigest()
+
+    def body_path(self, key):
+        return os.path.join(self.cache_dir, key + ".body")
+
+    def get(self, url, kind="GET"):
+        """Retourne l'entrée en cache (avec 'body') ou None. Met à jour l'ordre LRU."""
+        key = self.key(url, kind)
+        with self.lock:
+            entry = self.index.get(key)
+            if not entry:
+                return None
+            validated = entry.get('etag') or entry.get('last_modified')
+            if (entry.get('expires') or 0) < time.time() and not validated:
+                # Sans validateur, une entrée n'est valable que jusqu'à son échéance (redirections HEAD)
+                self.remove(key)
+                return None
+            # L'ordre LRU est sauvegardé à la prochaine écriture de l'index (put, flush)
+            entry['atime'] = time.time()
+            self.dirty = True
+            entry = dict(entry)
+        try:
+            with open(self.body_path(key), 'rb') as f:
+                body = f.read()
+        except OSError:
+            with self.lock:
+                self.index.pop(key, None)
+            return None
+        return dict(entry, body=body)
+
+    def flush(self):
+        """Sauvegarde l'index si des lectures ont changé l'ordre LRU (appelé à la sortie)"""
+        with self.lock:
+            if self.dirty:
+                self.save_index()
+
+    def put(self, url, final_url, body=b"", headers=None, kind="GET", ttl=None):
+        """
+        Enregistre une réponse avec ses validateurs puis applique l'éviction LRU.
+        ttl (s) : durée de vie d'une entrée sans validateur (ex. redirection HEAD)
+        """
+        headers = headers or {}
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        key = self.key(url, kind)
+        with self.lock:
+            tmp = self.body_path(key) + ".tmp"
+            with open(tmp, 'wb') as f:
+                f.write(body)
+            os.replace(tmp, self.body_path(key))
+            self.index[key] = {
+                'url': url,
+                'final_url': final_url,
+                'etag': headers.get('ETag'),
+                'last_modified': headers.get('Last-Modified'),
+                'content_type': headers.get('Content-Type'),
+                'size': len(body),
+                'atime': time.time(),
+                'expires': time.time() + ttl if ttl else None
+            }
+            self.evict()
+            self.save_index()
+
+    def conditional_headers(self, entry):
+        """En-têtes pour un GET conditionnel à partir d'une entrée en cache."""
+        headers = {}
+        if entry and entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def remove(self, key):
+        self.index.pop(key, None)
+        self.dirty = True
+        try:
+            os.remove(self.body_path(key))
+        except OSError:
+            pass
+
+    def evict(self):
+        """Supprime les entrées les moins récemment utilisées au-delà de max_bytes."""
+        total = sum(e['size'] for e in self.index.values())
+        if total <= self.max_bytes:
+            return
+        for key, entry in sorted(self.index.items(), key=lambda item: item[1]['atime']):
+            if total <= self.max_bytes:
+                break
+            total -= entry['size']
+            self.remove(key)
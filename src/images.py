@@ -0,0 +1,199 @@
+"""Cache local des images principales : téléchargées une fois, dédupliquées par contenu, réduites en vignettes
+
+Pillow est optionnel : sans lui, l'image d'origine est conservée telle quelle.
+"""
+
+import os, json, time
+import hashlib
+import threading
+from io import BytesIO
+
+# Types servis et extension du fichier en cache
+IMAGE_TYPES = {
+    'image/jpeg': 'jpg',
+    'image/png': 'png',
+    'image/gif': 'gif',
+    'image/webp': 'webp',
+    'image/avif': 'avif',
+    'image/svg+xml': 'svg',
+}
+MIME_TYPES = {ext: mime for mime, ext in IMAGE_TYPES.items()}
+
+
+def image_url(image):
+    """URL téléchargeable ou None (champ vide, 'None', data:)"""
+    image = (image or "").strip()
+    if image.startswith('//'):
+        image = "https:" + image
+    if not image.startswith(('http://', 'https://')):
+        return None
+    return image
+
+
+def url_key(image):
+    """Version courte de l'URL d'image : change avec elle, pour des URLs de vignette immuables"""
+    return hashlib.sha1(image.encode('utf-8')).hexdigest()[:12]
+
+
+class ImageCache:
+
+    def __init__(self, cache_dir, max_bytes=100 * 1024 * 1024, thumb_size=400, max_image_bytes=10 * 1024 * 1024, retry_hours=24):
+        """
+        Args:
+            cache_dir: Répertoire des vignettes et de index.json
+            max_bytes: Taille maximale du cache (éviction LRU)
+            thumb_size: Plus grand côté des vignettes (pixels)
+            max_image_bytes: Plafond de téléchargement d'une image
+            retry_hours: Délai avant de retenter une image en échec
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.thumb_size = thumb_size
+        self.max_image_bytes = max_image_bytes
+        self.retry = retry_hours * 3600
+        self.index_path = os.path.join(cache_dir, "index.json")
+        self.lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self.index = self.load_index()
+
+    def load_index(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except Exception:
+            index = {}
+        index.setdefault('urls', {})
+        index.setdefault('thumbs', {})
+        return index
+
+    def save_index(self):
+        tmp = self.index_path + ".tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f)
+        os.replace(tmp, self.index_path)
+
+    def thumb_path(self, digest):
+        return os.path.join(self.cache_dir, f"{digest}.{self.index['thumbs'][digest]['ext']}")
+
+    def lookup(self, url):
+        """(chemin, type MIME, empreinte) de la vignette en cache, ou None"""
+        with self.lock:
+            digest = self.index['urls'].get(url, {}).get('hash')
+            if not digest or digest not in self.index['thumbs']:
+                return None
+            # L'ordre LRU est sauvegardé à la prochaine écriture de l'index
+            self.index['thumbs'][digest]['atime'] = time.time()
+            path = self.thumb_path(digest)
+            return path, MIME_TYPES[self.index['thumbs'][digest]['ext']], digest
+
+    def get(self, url, session):
+        """Vignette de l'image (téléchargée au premier appel), ou None"""
+        url = image_url(url)
+        if not url:
+            return None
+        cached = self.lookup(url)
+        if cached and os.path.exists(cached[0]):
+            return cached
+
+        with self.lock:
+            failed = self.index['urls'].get(url, {}).get('failed', 0)
+        if time.time() - failed < self.retry:
+            return None
+
+        try:
+            body, content_type = self.download(url, session)
+        except Exception as e:
+            print(f"Image {url}: {e}")
+            with self.lock:
+                self.index['urls'][url] = {'failed': time.time()}
+                self.save_index()
+            return None
+
+        self.store(url, body, content_type)
+        return self.lookup(url)
+
+    def download(self, url, session):
+        """Corps et type de l'image, plafonné à max_image_bytes"""
+        response = session.get(url, stream=True, timeout=15)
+        try:
+            if response.status_code != 200:
+                raise ValueError(f"statut {response.status_code}")
+            content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+            if content_type not in IMAGE_TYPES:
+                raise ValueError(f"contenu {content_type or 'sans type'}")
+            chunks = []
+            size = 0
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                chunks.append(chunk)
+                size += len(chunk)
+                if size > self.max_image_bytes:
+                    raise ValueError(f"image de plus de {self.max_image_bytes} octets")
+            return b"".join(chunks), content_type
+        finally:
+            response.close()
+
+    def thumbnail(self, body, content_type):
+        """Vignette JPEG si Pillow est disponible, sinon l'image d'origine"""
+        if content_type != 'image/svg+xml':
+            try:
+                from PIL import Image
+
+                with Image.open(BytesIO(body)) as image:
+                    image = image.convert('RGB')
+                    image.thumbnail((self.thumb_size, self.thumb_size))
+                    out = BytesIO()
+                    image.save(out, 'JPEG', quality=80, optimize=True)
+                    return out.getvalue(), 'jpg'
+            except ImportError:
+                pass
+            except Exception as e:
+                print(f"Vignette impossible ({e}), image d'origine conservée")
+        return body, IMAGE_TYPES[content_type]
+
+    def store(self, url, body, content_type):
+        """Enregistre la vignette ; une image déjà vue (même contenu) n'est stockée qu'une fois"""
+        digest = hashlib.sha1(body).hexdigest()
+        with self.lock:
+            known = digest in self.index['thumbs']
+        if not known:
+            thumb, ext = self.thumbnail(body, content_type)
+            path = os.path.join(self.cache_dir, f"{digest}.{ext}")
+            tmp = path + ".tmp"
+            with open(tmp, 'wb') as f:
+                f.write(thumb)
+            os.replace(tmp, path)
+
+        with self.lock:
+            if not known:
+                self.index['thumbs'][digest] = {'ext': ext, 'size': len(thumb), 'atime': time.time()}
+            self.index['urls'][url] = {'hash': digest}
+            self.evict()
+            self.save_index()
+
+    def evict(self):
+        """Supprime les vignettes les moins récemment servies au-delà de max_bytes"""
+        thumbs = self.index['thumbs']
+        total = sum(t['size'] for t in thumbs.values())
+        if total <= self.max_bytes:
+            return
+        for digest, thumb in sorted(thumbs.items(), key=lambda item: item[1]['atime']):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(self.thumb_path(digest))
+            except OSError:
+                pass
+            total -= thumb['size']
+            del thumbs[digest]
+        self.index['urls'] = {u: e for u, e in self.index['urls'].items() if e.get('hash', '') in thumbs or 'failed' in e}
+
+
+def from_config(config):
+    """Cache paramétré par _param.yml (répertoire par défaut : _cache/images)"""
+    import tools
+
+    return ImageCache(
+        config.get('image_cache_dir') or tools.cache_dir("images"),
+        int(config.get('image_cache_mb', 100)) * 1024 * 1024,
+        int(config.get('thumb_size', 400))
+    )
@@ -1,9 +1,11 @@
 import requests, os, re, json, sys
 from datetime import datetime, timedelta
-from bs4 import BeautifulSoup
 import csv
 import time
 
+import transport
+import htmltree
+
 
 class Masto:
 
@@ -22,6 +24,11 @@ class Masto:
             'Authorization': f'Bearer {self.access_token}'
         }
 
+        # Connexions keep-alive partagées vers l'instance
+        transport.configure(config)
+        htmltree.set_backend(config.get('html_parser', 'lxml'))
+        self.session = transport.session("mastodon")
+
         self.calls_count = 0
         self.wait = 2.5 * 60
 
@@ -48,22 +55,18 @@ class Masto:
             'until': end_date
         }
         self.test_limits()
-        response = requests.get(url, headers=self.headers, params=params)
+        response = self.session.get(url, headers=self.headers, params=params)
         response.raise_for_status()
         return response.json()
 
 
     def extract_message_and_links(self, post_content):
-        # Parse the HTML content
-        soup = BeautifulSoup(post_content, 'html.parser')
-    
-        # Extract the text content
-        message = soup.get_text()
+        # Parse the HTML content (lxml, BeautifulSoup as fallback)
+        message, hrefs = htmltree.text_and_links(post_content)
 
         # Extract URLs, excluding user mentions
         links = []
-        for a in soup.find_all('a', href=True):
-            href = a['href']
+        for href in hrefs:
 
             if "tcrouzet" in href:
                 return None, None
@@ -127,7 +130,7 @@ class Masto:
         # We'll use the verify_credentials endpoint which is typically lightweight
         check_url = f"{self.masdodon_instance}/api/v1/accounts/verify_credentials"
         try:
-            check_response = requests.get(check_url, headers=self.headers)
+            check_response = self.session.get(check_url, headers=self.headers)
             check_response.raise_for_status()
             
             # Extract rate limit headers
@@ -196,7 +199,7 @@ class Masto:
         }
         
         self.test_limits()
-        search_response = requests.get(search_url, headers=self.headers, params=params)
+        search_response = self.session.get(search_url, headers=self.headers, params=params)
         search_response.raise_for_status()
         search_results = search_response.json()
         
@@ -219,7 +222,7 @@ class Masto:
         }
         
         self.test_limits()
-        relationship_response = requests.get(relationships_url, headers=self.headers, params=relationship_params)
+        relationship_response = self.session.get(relationships_url, headers=self.headers, params=relationship_params)
         relationship_response.raise_for_status()
         relationships = relationship_response.json()
         # print(relationships)
@@ -235,7 +238,7 @@ class Masto:
 
             follow_url = f"{self.masdodon_instance}/api/v1/accounts/{user_id}/follow"
             self.test_limits()
-            follow_response = requests.post(follow_url, headers=self.headers)
+            follow_response = self.session.post(follow_url, headers=self.headers)
             follow_response.raise_for_status()
             
             result = follow_response.json()
@@ -379,7 +382,7 @@ class Masto:
             if max_id:
                 params['max_id'] = max_id
             
-            response = requests.get(url, headers=self.headers, params=params)
+            response = self.session.get(url, headers=self.headers, params=params)
             response.raise_for_status()
             notifications = response.json()
             
@@ -424,7 +427,7 @@ class Masto:
                             # Télécharger l'image
                             try:
                                 self.test_limits()
-                                media_response = requests.get(media_url)
+                                media_response = self.session.get(media_url)
                                 media_response.raise_for_status()
                                 
                                 with open(media_path, 'wb') as f:
@@ -5,8 +5,9 @@ from datetime import datetime, timedelta, timezone
 
 from masto  import Masto
 from papers import Bookmarks
-import articles
 import tools
+import articles
+import transport
 
 os.system('clear')
 locale.setlocale(locale.LC_TIME, 'fr_FR')
@@ -35,6 +36,8 @@ latest_date = latest_date + timedelta(hours=1)
 end_date = datetime.now(timezone.utc)
 
 bookmarks = Bookmarks(config)
+# Processus de parsing créés avant tout accès réseau (notes brutes puis Mastodon)
+articles.parser_pool()
 bookmarks.get_new_bookmarks()
 
 # Get bookmarks from Masotodon
@@ -50,7 +53,8 @@ if True:
         if not os.path.exists(filepath):
             if "crouzet" in post['url']:
                 continue
-            article = articles.get_article_from_source(post['url'])
+            # Article déjà dans le coffre (autre note) : réutilisé sans téléchargement
+            article = bookmarks.fetch_article(post['url'])
             if post['source'] == 'crouzet':
                 comments = post['title']
                 source = "mastodon"
@@ -59,6 +63,7 @@ if True:
                 source = post['source']
             bookmarks.save_bookmark(article, filename, post['url'], post_datetime, comments.strip(), source)
 
+print(transport.report())
  
 posts_b = bookmarks.get_bookmarks(latest_date, end_date)
 
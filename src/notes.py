@@ -0,0 +1,153 @@
+"""Lecture d'une note en une passe : en-tête YAML, titre, ligne d'image et corps
+
+Le résultat est mis en cache par fichier tant que (mtime, taille) ne change pas.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+# Notes gardées en mémoire (les plus récemment lues)
+CACHE_SIZE = 2048
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def parse_header_lines(lines):
+    """Champs 'clé: valeur' d'un en-tête YAML (la valeur peut contenir ':' ou '---')"""
+    header = {}
+    for line in lines:
+        if ':' in line:
+            key, value = line.split(':', 1)
+            header[key.strip()] = value.strip().strip('"')
+    return header
+
+
+class Note:
+    """
+    header: dict des champs, None si la note n'a pas d'en-tête (note brute)
+    title: texte du premier titre '#' après l'en-tête (None sinon)
+    image: ligne ![...](...) suivant le titre (None sinon)
+    """
+
+    __slots__ = ('content', 'header', 'title', 'image', 'body_start', 'main_start')
+
+    def __init__(self, content):
+        self.content = content
+        self.header = None
+        self.title = None
+        self.image = None
+        self.main_start = 0     # après l'en-tête
+        self.body_start = None  # après la ligne de titre
+
+        lines = content.splitlines(keepends=True)
+        offset = 0
+        index = 0
+        if lines and lines[0].strip() == '---':
+            offset = len(lines[0])
+            for i in range(1, len(lines)):
+                if lines[i].strip() == '---':
+                    self.header = parse_header_lines(lines[1:i])
+                    index = i + 1
+                    offset += sum(len(line) for line in lines[1:i + 1])
+                    break
+            else:
+                offset = 0
+        self.main_start = offset
+
+        for line in lines[index:]:
+            offset += len(line)
+            stripped = line.strip()
+            if self.body_start is None:
+                if stripped.startswith('#'):
+                    self.title = stripped.lstrip('#').strip()
+                    self.body_start = offset
+            elif stripped:
+                if stripped.startswith('!['):
+                    self.image = stripped
+                break
+
+    @property
+    def main(self):
+        """Tout ce qui suit l'en-tête"""
+        return self.content[self.main_start:].strip()
+
+    @property
+    def body(self):
+        """Texte après la ligne de titre ("" sans titre)"""
+        if self.body_start is None:
+            return ""
+        return self.content[self.body_start:].strip()
+
+    def first_para(self):
+        """Premier paragraphe non vide, hors titres et images"""
+        if self.header is None:
+            return ""
+        kept = [line for line in self.main.split('\n') if not line.strip().startswith(('#', '!['))]
+        paragraphs = [p.strip() for p in '\n'.join(kept).split('\n\n')]
+        return next((p for p in paragraphs if p), '')
+
+
+def parse(content):
+    return Note(content or "")
+
+
+def read_header(path, limit=64 * 1024):
+    """
+    Lit l'en-tête YAML en streaming, jusqu'au '---' fermant, dans la limite de `limit` octets.
+
+    Returns:
+        dict des champs, ou None si la note n'a pas d'en-tête (note brute)
+    """
+    try:
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            if f.readline(limit).strip() != '---':
+                return None
+            lines = []
+            size = 0
+            while size < limit:
+                line = f.readline(limit - size)
+                if not line:
+                    break
+                if line.strip() == '---':
+                    return parse_header_lines(lines)
+                lines.append(line)
+                size += len(line)
+    except Exception as e:
+        print(f"Error reading file {path}: {e}")
+        return None
+
+    # Pas de '---' fermant dans la limite : lecture complète
+    note = load(path)
+    return note.header if note else None
+
+
+def load(path, stat=None):
+    """Note lue et analysée une fois par (mtime, taille) ; None si illisible"""
+    try:
+        stat = stat or os.stat(path)
+    except OSError as e:
+        print(f"Error reading file {path}: {e}")
+        return None
+    key = (stat.st_mtime, stat.st_size)
+
+    with _cache_lock:
+        cached = _cache.get(path)
+        if cached and cached[0] == key:
+            _cache.move_to_end(path)
+            return cached[1]
+
+    try:
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            note = Note(f.read())
+    except Exception as e:
+        print(f"Error reading file {path}: {e}")
+        return None
+
+    with _cache_lock:
+        _cache[path] = (key, note)
+        _cache.move_to_end(path)
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return note
@@ -1,11 +1,21 @@
 """Remplace les daily notes dans Obsidian par leur contenu"""
 
 import os, re
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone  
+from urllib.parse import urlparse
 from dateutil import parser
 
 import tools
+import notes
 import articles
+import extractors
+import transport
+import urlindex
+import vaultindex
+import dateindex
+import images
 
 class Bookmarks:
 
@@ -16,6 +26,27 @@ class Bookmarks:
         script_dir = self.parent_dir
 
         self.sources_dir = config['obsidian']
+        articles.configure(config)
+
+        # Mode concurrent : nombre de workers et requêtes simultanées par hôte
+        self.workers = max(1, int(config.get('workers', 1)))
+        self.per_host = max(1, int(config.get('per_host', 2)))
+        self.host_slots = {}
+        self.host_lock = threading.Lock()
+
+        # Lecture des en-têtes YAML limitée aux premiers Ko de chaque note
+        self.header_bytes = int(config.get('front_matter_kb', 64)) * 1024
+
+        # État des notes (mtime, taille, en-tête, date) : seules les notes modifiées sont relues
+        self.vault = vaultindex.from_config(config)
+        self.dates = dateindex.from_config(config)
+
+        # URLs canoniques déjà enregistrées dans le coffre (url: et add_source:)
+        self.url_index = urlindex.from_config(config)
+
+        # Vignettes locales des images principales (servies par web.py)
+        self.cache_images = config.get('cache_images', True)
+        self.images = images.from_config(config)
 
     def file_path(self, file):
         return os.path.join(self.sources_dir, file)
@@ -76,11 +107,12 @@ class Bookmarks:
                 exit()
         return None
 
-    def get_bookmark_created(self, file_path):
+    def get_bookmark_created(self, file_path, file_stat=None):
         """Retourne la date de création du fichier"""
         try:
             # Récupère les stats du fichier
-            file_stat = os.stat(file_path)
+            if file_stat is None:
+                file_stat = os.stat(file_path)
             
             # Sur macOS, utiliser st_birthtime (date de création réelle)
             # Sur Linux, st_ctime est le change time, pas la création
@@ -100,54 +132,24 @@ class Bookmarks:
             return None
 
     def has_yaml_header(self, content):
-        # Diviser le contenu en lignes
-        lines = content.splitlines()
-
-        # Vérifier si le contenu commence par un en-tête YAML
-        if len(lines) > 0 and lines[0].strip() == '---':
-            # Chercher la fin de l'en-tête YAML
-            for line in lines[1:]:
-                if line.strip() == '---':
-                    return True
-        return False
+        """La note commence-t-elle par un en-tête YAML fermé ?"""
+        return notes.parse(content).header is not None
     
     def extract_yaml_header(self, content):
         """Extrait l'en-tête YAML d'un contenu markdown."""
-        header = {}
-        if self.has_yaml_header(content):
-            # Extract the YAML front matter
-            yaml_content = content.split('---')[1].strip()
-            for line in yaml_content.splitlines():
-                # print(line)
-
-                if ':' in line:
-                    key, value = line.split(':', 1)
-                    header[key.strip()] = value.strip().strip('"')
-                    # if key=="public":
-                    #     print("PUBLIC")
-                    #     print(header[key.strip()])
-
-        return header
+        return notes.parse(content).header or {}
 
-    def get_first_para(self, content):
-        content_parts = content.split('---', 2)
-        if len(content_parts) >= 3:
-            main_content = content_parts[2].strip()
-            
-            # Ignore le titre (première ligne commençant par #)
-            content_lines = main_content.split('\n')
-            content_without_title = '\n'.join(line for line in content_lines if not line.strip().startswith('#'))
-            
-            # Ignore la ligne d'image si elle existe
-            content_without_image = '\n'.join(line for line in content_without_title.split('\n') if not line.strip().startswith('!['))
-            
-            # Récupère le premier paragraphe non vide
-            paragraphs = [p.strip() for p in content_without_image.split('\n\n')]
-            first_paragraph = next((p for p in paragraphs if p), '')
+    def read_yaml_header(self, file):
+        """
+        Lit l'en-tête YAML en streaming, jusqu'au '---' fermant, sans charger l'article.
 
-            return first_paragraph
+        Returns:
+            dict des champs, ou None si la note n'a pas d'en-tête (note brute)
+        """
+        return notes.read_header(self.file_path(file), self.header_bytes)
 
-        return ""
+    def get_first_para(self, content):
+        return notes.parse(content).first_para()
 
 
     def get_article(self, new_source, created):
@@ -186,9 +188,19 @@ class Bookmarks:
 
 
     def save_bookmark(self, article, file, url, created, comment="", source=""):
+        if extractors.is_deferred(article):
+            # Pas de note "No Text" : la note brute reste à traiter au prochain passage
+            print(f"Reporté ({article['reason']}): {url}")
+            return False
         if article:
             new_content = self.format_article(article, url, created, comment, source)
             if self.save_markdown(file, new_content):
+                self.index_note(file, notes.parse(new_content).header)
+                _, text, canonical_link, image, _ = self.get_article(article, created)
+                if text and text != "No Text":
+                    self.url_index.add(file, url, canonical_link)
+                if self.cache_images:
+                    self.images.get(image, transport.session())
                 return True
         print("Save_bookmark bug",url)
         return False
@@ -215,108 +227,240 @@ class Bookmarks:
         return comment_text if comment_text else ""
 
 
-    def get_new_bookmarks(self):
-        """ Parcours tous les fichiers MD dans sources_dir """
-        url_pattern = re.compile(r'https?://[^\s)]+')
-
-        for file in os.listdir(self.sources_dir):
-            file_path = os.path.join(self.sources_dir, file)
+    def host_slot(self, url):
+        """Retourne le sémaphore limitant les requêtes simultanées vers un hôte."""
+        host = urlparse(url).netloc.lower()
+        with self.host_lock:
+            if host not in self.host_slots:
+                self.host_slots[host] = threading.Semaphore(self.per_host)
+            return self.host_slots[host]
 
-            if os.path.isfile(file_path):
+    def article_from_note(self, file):
+        """Reconstruit l'article enregistré dans une note (même format que get_article_from_source)"""
+        note = notes.load(self.file_path(file))
+        if not note or note.header is None:
+            return None
+        header = note.header
+        text = note.body
+        image = header.get('image', "")
+        if image in ("", "None"):
+            image = ""
+        elif text.startswith(f"![image]({image})"):
+            text = text[len(f"![image]({image})"):].strip()
+        if not text or text == "No Text":
+            return None
+        return {
+            'title': header.get('title', "No Title"),
+            'text': text,
+            'canonical_link': header.get('url', ""),
+            'image': image,
+            'publish': header.get('date', "")
+        }
+
+    def existing_article(self, url):
+        """Article déjà présent dans le coffre pour cette URL (raccourcisseurs résolus), sinon None"""
+        file = self.url_index.lookup(url)
+        if not file and articles.is_shortener_url(url):
+            file = self.url_index.lookup(articles.resolve_redirects(url))
+        if not file:
+            return None
+        article = self.article_from_note(file)
+        if article:
+            print(f"{url}: déjà enregistré dans {file}")
+        return article
 
-                created = self.get_bookmark_created(file_path)
-                if not created:
-                    continue
-                
-                content = self.read_markdown(file)
-                if not content:
-                    continue
-                
-                if self.has_yaml_header(content):
-                    continue
+    def fetch_article(self, url, budget=None):
+        """Article réutilisé depuis le coffre, sinon téléchargé (budget : voir get_article_from_source)"""
+        article = self.existing_article(url)
+        if article:
+            return article
+        if articles.is_shortener_url(url):
+            # Créneau du raccourcisseur pour la seule résolution (HEAD en cache), puis celui du vrai site
+            with self.host_slot(url):
+                url = articles.resolve_redirects(url)
+        with self.host_slot(url):
+            return articles.get_article_from_source(url, budget=budget)
+
+    def fetch_and_save(self, url, file_save, created, com, budget=None):
+        """Télécharge un article et écrit aussitôt le bookmark correspondant."""
+        article = self.fetch_article(url, budget)
+        return self.save_bookmark(article, file_save, url, created, com)
+
+    def parse_note(self, file, file_stat):
+        """En-tête (None pour une note brute) et date de création d'une note, pour l'index du coffre"""
+        return self.read_yaml_header(file), self.get_bookmark_created(self.file_path(file), file_stat)
+
+    def index_note(self, file, header):
+        """Met à jour l'index du coffre pour une note qui vient d'être écrite"""
+        try:
+            file_stat = os.stat(self.file_path(file))
+        except OSError:
+            return
+        created = self.get_bookmark_created(self.file_path(file), file_stat)
+        self.vault.update(file, file_stat, header, created)
+        self.dates.update({file: self.bookmark_date(file, header, created) if header is not None else None})
+
+    def bookmark_date(self, file, header, created):
+        """Date du bookmark : horodatage du nom de fichier, sinon champ add:, sinon date du fichier"""
+        match = re.match(r'(\d{4})-(\d{2})-(\d{2})-(\d{2})(\d{2})', file)
+        if match:
+            try:
+                return datetime(*map(int, match.groups()), tzinfo=timezone.utc)
+            except ValueError:
+                pass
+        try:
+            added = datetime.fromisoformat((header or {}).get('add', ""))
+            return added if added.tzinfo else added.replace(tzinfo=timezone.utc)
+        except ValueError:
+            return created
+
+    def note_date(self, file):
+        note = self.vault.get(file)
+        return self.bookmark_date(file, note[1], note[0]) if note else None
+
+    def refresh_vault(self):
+        """Relit les notes ajoutées ou modifiées depuis le dernier passage, puis l'index des dates"""
+        changed, removed = self.vault.refresh(self.sources_dir, self.parse_note)
+        if self.vault.replaced or len(self.dates) != self.vault.count(processed=True):
+            # Index des dates absent, désynchronisé ou d'un autre coffre : reconstruit sans relire les notes
+            self.dates.rebuild({
+                file: self.bookmark_date(file, header, created)
+                for file, created, header in self.vault.notes(processed=True)
+            })
+        elif changed or removed:
+            self.dates.update({file: self.note_date(file) for file in changed}, removed)
+
+    def refresh_url_index(self):
+        """Met à jour l'index des URLs à partir des en-têtes de l'index du coffre"""
+        self.url_index.refresh(self.sources_dir, self.vault.header)
+
+    def note_jobs(self, file, created):
+        """Téléchargements à faire pour une note brute : (url, fichier à écrire, date, commentaire)"""
+        url_pattern = re.compile(r'https?://[^\s)]+')
+        note = notes.load(self.file_path(file))
+        if not note or not note.content:
+            return []
+
+        if note.header is not None:
+            return []
+        content = note.content
+
+        print(created)
+
+        # Find all URLs
+        urls = url_pattern.findall(content)
+        com = self.extract_comment_from_content(content)
+        jobs = []
+        for urls_index, url in enumerate(urls):
+            if urls_index == 0:
+                file_save = file
+            else:
+                file_save = file.replace(".md", f"_{urls_index}.md")
+            jobs.append((url, file_save, created, com))
+        return jobs
 
-                print(created)
+    def process_note(self, file, budget=None):
+        """
+        Traite une note dès son arrivée (mode surveillance, voir watch.py) ; retourne le nombre d'URLs.
+        budget : RunBudget propre à cette note (par défaut celui de la session)
+        """
+        try:
+            file_stat = os.stat(self.file_path(file))
+        except OSError:
+            return 0
+        header, created = self.parse_note(file, file_stat)
+        self.vault.update(file, file_stat, header, created)
+        if header is not None or not created:
+            return 0
+
+        jobs = self.note_jobs(file, created)
+        for job in jobs:
+            try:
+                self.fetch_and_save(*job, budget=budget)
+            except Exception as e:
+                print(f"Erreur de traitement pour {job[0]}: {e}")
+        return len(jobs)
 
-                # Find all URLs
-                urls = url_pattern.findall(content)
-                urls_index = 0
-                for url in urls:
-                    if urls_index == 0:
-                        file_save = file
-                    else:
-                        file_save = file.replace(".md", f"_{urls_index}.md")
-                    article = articles.get_article_from_source(url)
-                    com = self.extract_comment_from_content(content)
-                    self.save_bookmark(article, file_save, url, created, com)
-                    urls_index += 1
+    def get_new_bookmarks(self, workers=None, budget=None):
+        """ Parcours tous les fichiers MD dans sources_dir """
+        workers = self.workers if workers is None else max(1, workers)
+        self.refresh_vault()
+        self.refresh_url_index()
+
+        jobs = []
+        # Seules les notes brutes (sans en-tête YAML) sont relues
+        for file, created, _ in self.vault.notes(processed=False):
+            if not created:
+                continue
+            jobs.extend(self.note_jobs(file, created))
+
+        # Une même URL présente dans plusieurs notes n'est téléchargée qu'une fois :
+        # les doublons passent après, quand l'index contient la première
+        seen = set()
+        first, duplicates = [], []
+        for job in jobs:
+            key = urlindex.canonical_url(job[0])
+            (duplicates if key in seen else first).append(job)
+            seen.add(key)
+
+        # Parsing dans des processus séparés, créés avant les threads de téléchargement
+        if jobs:
+            articles.parser_pool()
+
+        if workers == 1:
+            for job in first + duplicates:
+                self.fetch_and_save(*job, budget=budget)
+            return len(jobs)
+
+        # Pool borné : chaque fichier est écrit dès que son article est prêt
+        print(f"{len(jobs)} URLs, {workers} workers, {self.per_host} par hôte")
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for batch in (first, duplicates):
+                futures = {pool.submit(self.fetch_and_save, *job, budget=budget): job for job in batch}
+                for future in as_completed(futures):
+                    url = futures[future][0]
+                    try:
+                        future.result()
+                    except Exception as e:
+                        print(f"Erreur de traitement pour {url}: {e}")
+        return len(jobs)
 
 
     def get_content(self,content):
-        article_content = ""
-        content_parts = content.split('---', 2)
-        
-        if len(content_parts) >= 3:
-            main_content = content_parts[2].strip()
-            
-            # Trouvons le titre (première ligne commençant par #)
-            lines = main_content.split('\n')
-            title_index = -1
-            
-            for i, line in enumerate(lines):
-                if line.strip().startswith('#'):
-                    title_index = i
-                    break
-            
-            # Si on a trouvé un titre, on prend tout ce qui est après
-            if title_index != -1:
-                article_content = '\n'.join(lines[title_index+1:]).strip()
-
-        return article_content
+        """Texte de l'article : ce qui suit le titre, pour une note avec en-tête"""
+        note = notes.parse(content)
+        return note.body if note.header is not None else ""
     
     
     def get_bookmarks(self, start_date, end_date):
         """Retourne les bookmarks entre deux dates avec titre et URL."""
         bookmarks = []
 
-        files = os.listdir(self.sources_dir)
-        sorted_files = sorted(files, reverse=True)
+        # Fenêtre de dates par bisection, en-têtes depuis l'index : seules les notes retenues sont lues
+        self.refresh_vault()
+        for file, publish_date in self.dates.between(start_date, end_date):
+            yaml_header = self.vault.header(file)
+            if not yaml_header:
+                continue
 
-        # Puis itérer sur la liste triée
-        for file in sorted_files:
+            if yaml_header.get('public','true').lower() == 'false':
+                continue
 
-            file_path = os.path.join(self.sources_dir, file)
-            if os.path.isfile(file_path):
+            print(file)
 
-                content = self.read_markdown(file)
-                if not content:
-                    print(f"No makdown {file}")
-                    continue
+            note = notes.load(self.file_path(file))
+            if not note or not note.content:
+                print(f"No makdown {file}")
+                continue
 
-                yaml_header = self.extract_yaml_header(content)
-                if not yaml_header:
-                    print(f"No YALM header {file}")
-                    continue
-
-                if yaml_header.get('public','true').lower() == 'false':
-                    continue
-
-                publish_date = self.get_bookmark_created(file_path)
-                
-                if not publish_date:
-                    continue
-
-                if start_date <= publish_date <= end_date:
-                    # print(start_date, publish_date, end_date, file)
-                    print(file)
-                    
-                    bookmarks.append({
-                        'title': yaml_header.get('title'),
-                        'url': yaml_header.get('url'),
-                        'date': publish_date.isoformat(),
-                        'source': yaml_header.get('source',''),
-                        'comment': yaml_header.get('comment', "").strip(),
-                        'text': self.get_content(content)
-                    })
+            bookmarks.append({
+                'title': yaml_header.get('title'),
+                'url': yaml_header.get('url'),
+                'date': publish_date.isoformat(),
+                'source': yaml_header.get('source',''),
+                'comment': yaml_header.get('comment', "").strip(),
+                'text': note.body
+            })
 
         return bookmarks
 
@@ -344,3 +488,4 @@ if __name__ == '__main__':
         # print( articles.get_article(test_url))
     else:
         bookmarks.get_new_bookmarks()
+        print(transport.report())
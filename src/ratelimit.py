@@ -0,0 +1,64 @@
+"""Politesse par hôte : un seau à jetons par domaine au lieu de pauses aléatoires"""
+
+import time
+import threading
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+
+    def __init__(self, rate, burst):
+        """
+        Args:
+            rate: Jetons regagnés par seconde (requêtes/s en régime établi)
+            burst: Nombre de requêtes autorisées d'affilée
+        """
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.stamp = time.monotonic()
+
+    def reserve(self):
+        """Consomme un jeton et retourne le délai (s) à attendre avant de l'utiliser"""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+
+class HostLimiter:
+
+    def __init__(self, rate=0.5, burst=2, overrides=None):
+        """
+        Args:
+            rate: Requêtes/s par défaut pour chaque hôte
+            burst: Rafale autorisée par défaut
+            overrides: {hôte: {'rate': .., 'burst': ..}} pour des sites particuliers
+        """
+        self.rate = rate
+        self.burst = burst
+        self.overrides = overrides or {}
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def bucket(self, host):
+        if host not in self.buckets:
+            custom = self.overrides.get(host) or self.overrides.get(host.removeprefix("www.")) or {}
+            self.buckets[host] = TokenBucket(
+                float(custom.get('rate', self.rate)),
+                float(custom.get('burst', self.burst))
+            )
+        return self.buckets[host]
+
+    def wait(self, url):
+        """Attend seulement si le même hôte a été contacté trop récemment"""
+        host = urlparse(url).netloc.lower()
+        with self.lock:
+            delay = self.bucket(host).reserve()
+        if delay > 0:
+            print(f"Politesse {host}: pause de {delay:.1f}s")
+            time.sleep(delay)
+        return delay
@@ -0,0 +1,88 @@
+"""Mémoire par domaine des stratégies d'extraction qui fonctionnent"""
+
+import os, json, time
+import threading
+
+
+class StrategyBoard:
+
+    def __init__(self, path, skip_after=3, skip_days=7):
+        """
+        Args:
+            path: Fichier JSON de persistance
+            skip_after: Nombre d'échecs consécutifs avant d'ignorer une stratégie
+            skip_days: Durée (jours) pendant laquelle une stratégie en échec est ignorée
+        """
+        self.path = path
+        self.skip_after = skip_after
+        self.skip_seconds = skip_days * 86400
+        self.lock = threading.Lock()
+        self.hosts = self.load()
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
+    def save(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.hosts, f, indent=1)
+        os.replace(tmp, self.path)
+
+    def stats(self, host, strategy):
+        return self.hosts.get(host, {}).get(strategy)
+
+    def is_failing(self, stats, now=None):
+        """Stratégie en échec répété et récent"""
+        now = now or time.time()
+        return (stats['streak'] >= self.skip_after
+                and now - stats['last_fail'] < self.skip_seconds)
+
+    def order(self, host, strategies):
+        """
+        Trie les stratégies pour un hôte : d'abord celles qui ont déjà réussi (meilleur taux
+        de succès puis latence moyenne), puis les inconnues dans l'ordre par défaut, puis
+        celles qui échouent. Les stratégies en échec répété récent sont ignorées.
+        """
+        with self.lock:
+            known = self.hosts.get(host, {})
+            now = time.time()
+            winners, untried, losers = [], [], []
+            for strategy in strategies:
+                stats = known.get(strategy)
+                if not stats:
+                    untried.append(strategy)
+                elif self.is_failing(stats, now):
+                    print(f"Stratégie ignorée pour {host}: {strategy}")
+                elif stats['success']:
+                    winners.append(strategy)
+                else:
+                    losers.append(strategy)
+
+        def score(strategy):
+            stats = known[strategy]
+            rate = stats['success'] / stats['tries']
+            return (-rate, stats['time'] / stats['success'])
+
+        ordered = sorted(winners, key=score) + untried + losers
+        # Ne jamais tout ignorer : on retente alors l'ordre par défaut
+        return ordered or list(strategies)
+
+    def record(self, host, strategy, success, duration):
+        """Enregistre le résultat d'une tentative"""
+        with self.lock:
+            stats = self.hosts.setdefault(host, {}).setdefault(strategy, {
+                'tries': 0, 'success': 0, 'time': 0.0, 'streak': 0, 'last_fail': 0
+            })
+            stats['tries'] += 1
+            if success:
+                stats['success'] += 1
+                stats['time'] += duration
+                stats['streak'] = 0
+            else:
+                stats['streak'] += 1
+                stats['last_fail'] = time.time()
+            self.save()
@@ -1,5 +1,43 @@
+import os
+import sys
 import yaml
 
 def site_yml(path):
     with open(path, 'r') as file:
         return yaml.safe_load(file)
+
+def cache_dir(*parts):
+    """Répertoire _cache/ à la racine du projet (créé au besoin)."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    path = os.path.join(root, "_cache", *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def scan_notes(directory, extensions=('.md',)):
+    """
+    Parcours du coffre en un appel os.scandir : (DirEntry, stat) de chaque fichier.
+    Le type vient de readdir et le stat est mis en cache par DirEntry : un seul appel système par note,
+    à réutiliser (dates, comparaison mtime/taille) avant toute ouverture.
+    """
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if extensions and not entry.name.endswith(extensions):
+                continue
+            try:
+                if not entry.is_file():
+                    continue
+                yield entry, entry.stat()
+            except OSError:
+                continue
+
+def fork_context():
+    """
+    Contexte multiprocessing 'fork' sous Linux, None ailleurs (parsing dans le thread courant).
+    macOS : fork sans exec est dangereux (CPython l'a abandonné par défaut), et spawn
+    ré-exécuterait les scripts sans garde __main__ comme news.py.
+    """
+    import multiprocessing
+
+    if sys.platform.startswith('linux') and 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork')
+    return None
@@ -0,0 +1,182 @@
+"""Sessions HTTP partagées par articles.py et masto.py : pools keep-alive, timeouts, retries, compteurs"""
+
+import ssl
+import threading
+
+# requests et urllib3 ne sont importés qu'à la création de la première session (démarrage rapide)
+
+# Paramètres issus de _param.yml (voir configure)
+config = {}
+
+counters = {'requests': 0, 'opened': 0}
+_counters_lock = threading.Lock()
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def configure(new_config):
+    """Transmet la configuration du projet à la couche transport"""
+    config.update(new_config or {})
+
+
+def count(name):
+    with _counters_lock:
+        counters[name] += 1
+
+
+# Plafond (s) d'un Retry-After respecté : au-delà, l'erreur remonte au moteur (autre stratégie, backoff)
+RETRY_AFTER_MAX = 5
+
+
+def retry_policy(name="default"):
+    """
+    Retries avec backoff exponentiel (GET/HEAD uniquement).
+
+    Articles : erreurs de connexion seulement ; un timeout de lecture ou un 429/5xx remonte
+    aussitôt au moteur, qui gère délai par URL, budget et autres stratégies.
+    Mastodon ("mastodon") : aussi les 502/503/504 passagers de l'instance, Retry-After plafonné ;
+    les 429 restent gérés par Masto.test_limits.
+    """
+    retries = int(config.get('http_retries', 2))
+    policy = dict(
+        total=retries,
+        connect=retries,
+        read=0,
+        other=0,
+        status=0,
+        backoff_factor=float(config.get('http_backoff', 0.5)),
+        allowed_methods=frozenset(['HEAD', 'GET']),
+        respect_retry_after_header=False,
+        raise_on_status=False
+    )
+    if name == "mastodon":
+        policy.update(status=retries, status_forcelist=(502, 503, 504), respect_retry_after_header=True)
+    return classes()['retry'](**policy)
+
+
+_classes = {}
+
+
+def classes():
+    """Pools comptés et adaptateur keep-alive, définis au premier usage"""
+    if _classes:
+        return _classes
+
+    from requests.adapters import HTTPAdapter
+    from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+    from urllib3.util.retry import Retry
+
+    class CountingHTTPConnectionPool(HTTPConnectionPool):
+        def _new_conn(self):
+            count('opened')
+            return super()._new_conn()
+
+    class CountingHTTPSConnectionPool(HTTPSConnectionPool):
+        def _new_conn(self):
+            count('opened')
+            return super()._new_conn()
+
+    pools = {'http': CountingHTTPConnectionPool, 'https': CountingHTTPSConnectionPool}
+
+    class CappedRetry(Retry):
+        """Retry-After plafonné : urllib3 accepte sinon jusqu'à 6 h, dormies dans le worker"""
+
+        def get_retry_after(self, response):
+            retry_after = super().get_retry_after(response)
+            return None if retry_after is None else min(retry_after, RETRY_AFTER_MAX)
+
+    class PooledAdapter(HTTPAdapter):
+        """Adaptateur keep-alive avec timeout par défaut et comptage des requêtes"""
+
+        def __init__(self, timeout, **kwargs):
+            self.timeout = timeout
+            super().__init__(**kwargs)
+
+        def init_poolmanager(self, *args, **kwargs):
+            super().init_poolmanager(*args, **kwargs)
+            self.poolmanager.pool_classes_by_scheme = pools
+
+        def send(self, request, timeout=None, **kwargs):
+            count('requests')
+            return super().send(request, timeout=timeout or self.timeout, **kwargs)
+
+    _classes.update(pools=pools, adapter=PooledAdapter, retry=CappedRetry)
+    return _classes
+
+
+def instrument(adapter):
+    """Branche compteurs et retries sur un adaptateur existant (ex. celui de cloudscraper)"""
+    adapter.max_retries = retry_policy()
+    adapter.poolmanager.pool_classes_by_scheme = classes()['pools']
+    return adapter
+
+
+def new_adapter(name="default"):
+    return classes()['adapter'](
+        timeout=float(config.get('http_timeout', 15)),
+        pool_connections=int(config.get('pool_hosts', 50)),
+        pool_maxsize=int(config.get('pool_per_host', 4)),
+        max_retries=retry_policy(name)
+    )
+
+
+def session(name="default", verify=True):
+    """
+    Session partagée (une par nom) : réutilise les connexions TCP/TLS entre appels.
+
+    Args:
+        name: Nom de la session (ex. "mastodon", "insecure")
+        verify: Vérification des certificats SSL
+    """
+    with _sessions_lock:
+        if name not in _sessions:
+            import requests
+            import urllib3
+
+            s = requests.Session()
+            adapter = new_adapter(name)
+            s.mount('http://', adapter)
+            s.mount('https://', adapter)
+            s.verify = verify
+            if not verify:
+                urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+            _sessions[name] = s
+        return _sessions[name]
+
+
+def scraper():
+    """Scraper cloudscraper partagé, sans vérification SSL"""
+    with _sessions_lock:
+        if 'cloudscraper' not in _sessions:
+            import cloudscraper
+            import urllib3
+
+            # Créer un contexte SSL qui ignore la vérification
+            ssl_context = ssl.create_default_context()
+            ssl_context.check_hostname = False
+            ssl_context.verify_mode = ssl.CERT_NONE
+
+            s = cloudscraper.create_scraper(
+                ssl_context=ssl_context,
+                browser={
+                    'browser': 'chrome',
+                    'platform': 'windows',
+                    'desktop': True
+                }
+            )
+            # Garder l'adaptateur TLS de cloudscraper, seulement instrumenté
+            for adapter in set(s.adapters.values()):
+                instrument(adapter)
+            s.hooks['response'].append(lambda response, *args, **kwargs: count('requests'))
+            s.verify = False
+            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+            _sessions['cloudscraper'] = s
+        return _sessions['cloudscraper']
+
+
+def report():
+    """Résumé des connexions ouvertes vs réutilisées"""
+    with _counters_lock:
+        sent, opened = counters['requests'], counters['opened']
+    reused = max(0, sent - opened)
+    return f"HTTP: {sent} requêtes, {opened} connexions ouvertes, {reused} réutilisées"
@@ -0,0 +1,173 @@
+"""Index persistant des URLs canoniques du coffre : une URL déjà enregistrée n'est pas retéléchargée
+
+python3 src/urlindex.py <url>   # forme canonique et note existante
+"""
+
+import os, sys, json
+import threading
+from urllib.parse import urlparse, parse_qsl, urlencode
+
+import tools
+
+# Paramètres de suivi supprimés (en plus des préfixes ci-dessous)
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'igshid', 'yclid', 'twclid',
+    'ref', 'ref_src', 'ref_url', 'amp', 'outputtype', 'cmpid', '__twitter_impression'
+}
+TRACKING_PREFIXES = ('utm_', 'mc_')
+
+# Caches AMP : https://<x>.cdn.ampproject.org/c/s/<hôte>/<chemin>, https://www.google.com/amp/s/<hôte>/<chemin>
+AMP_CACHE_HOSTS = ('.cdn.ampproject.org',)
+
+
+def strip_amp(host, path):
+    """
+    Retire les variantes AMP : caches AMP, hôte amp.*, suffixe .amp (ou .amp.html) du dernier
+    segment, segment /amp final d'un chemin d'article (au moins deux segments avant lui :
+    github.com/foo/amp ou example.com/amp sont des pages à part entière).
+    """
+    parts = path.split('/')
+    if host.endswith(AMP_CACHE_HOSTS) and len(parts) > 3 and parts[1] in ('c', 'v'):
+        # /c/s/hôte/chemin (s = https)
+        offset = 3 if parts[2] == 's' else 2
+        return strip_amp(parts[offset].lower(), '/' + '/'.join(parts[offset + 1:]))
+    if host in ('google.com', 'www.google.com') and len(parts) > 3 and parts[1] == 'amp':
+        offset = 3 if parts[2] == 's' else 2
+        return strip_amp(parts[offset].lower(), '/' + '/'.join(parts[offset + 1:]))
+
+    if host.startswith('amp.'):
+        host = host[4:]
+    while len(parts) > 1 and parts[-1] == '':
+        parts.pop()
+    if len(parts) > 3 and parts[-1] == 'amp':
+        parts.pop()
+    if parts[-1].endswith('.amp'):
+        parts[-1] = parts[-1][:-4]
+    elif '.amp.' in parts[-1]:
+        parts[-1] = parts[-1].replace('.amp.', '.')
+    return host, '/'.join(parts)
+
+
+def canonical_url(url):
+    """
+    Clé de déduplication : hôte en minuscules sans www ni port par défaut, http et https
+    confondus, sans slash final, fragment, paramètres de suivi ni variante AMP.
+    """
+    if not url:
+        return url
+    try:
+        parsed = urlparse(url.strip())
+        host = (parsed.hostname or "").lower()
+        if parsed.port and parsed.port not in (80, 443):
+            host = f"{host}:{parsed.port}"
+    except ValueError:
+        return url.strip()
+
+    host, path = strip_amp(host, parsed.path)
+    if host.startswith('www.'):
+        host = host[4:]
+    path = path.rstrip('/')
+
+    query = [
+        (k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith(TRACKING_PREFIXES)
+    ]
+    query = f"?{urlencode(sorted(query))}" if query else ""
+    return f"{host}{path}{query}"
+
+
+class UrlIndex:
+
+    def __init__(self, path):
+        """
+        Args:
+            path: Fichier JSON de persistance
+        """
+        self.path = path
+        self.lock = threading.Lock()
+        self.data = self.load()
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception:
+            data = {}
+        data.setdefault('urls', {})
+        data.setdefault('files', {})
+        return data
+
+    def save(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, indent=1, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+    def forget(self, file):
+        entry = self.data['files'].pop(file, None)
+        for key in (entry or {}).get('urls', []):
+            if self.data['urls'].get(key) == file:
+                del self.data['urls'][key]
+                # Une autre note peut contenir la même URL
+                other = next((f for f, e in self.data['files'].items() if key in e['urls']), None)
+                if other:
+                    self.data['urls'][key] = other
+
+    def index(self, file, urls, mtime=0, size=0, latest=False):
+        self.forget(file)
+        keys = sorted({canonical_url(u) for u in urls if u and u != "None"})
+        self.data['files'][file] = {'mtime': mtime, 'size': size, 'urls': keys}
+        for key in keys:
+            if latest:
+                self.data['urls'][key] = file
+            else:
+                self.data['urls'].setdefault(key, file)
+
+    def refresh(self, sources_dir, read_header):
+        """
+        Met l'index à jour : seules les notes nouvelles ou modifiées (mtime, taille) sont relues.
+
+        Args:
+            sources_dir: Répertoire des notes
+            read_header: fonction(fichier) -> dict de l'en-tête YAML ({} si note brute)
+        """
+        with self.lock:
+            seen = set()
+            changed = False
+            for entry, stat in tools.scan_notes(sources_dir):
+                file = entry.name
+                seen.add(file)
+                entry = self.data['files'].get(file)
+                if entry and entry['mtime'] == stat.st_mtime and entry['size'] == stat.st_size:
+                    continue
+                header = read_header(file)
+                self.index(file, [header.get('url'), header.get('add_source')], stat.st_mtime, stat.st_size)
+                changed = True
+
+            for file in [f for f in self.data['files'] if f not in seen]:
+                self.forget(file)
+                changed = True
+            if changed:
+                self.save()
+
+    def lookup(self, url):
+        """Note qui contient déjà cette URL, ou None"""
+        with self.lock:
+            return self.data['urls'].get(canonical_url(url))
+
+    def add(self, file, *urls):
+        """Enregistre une note qui vient d'être écrite (prioritaire sur les plus anciennes)"""
+        with self.lock:
+            self.index(file, urls, latest=True)
+            self.save()
+
+
+def from_config(config):
+    """Index paramétré par _param.yml (fichier par défaut : _cache/urls.json)"""
+    return UrlIndex(config.get('url_index_file') or os.path.join(tools.cache_dir(), "urls.json"))
+
+
+if __name__ == '__main__':
+    index = from_config(tools.site_yml('_param.yml'))
+    for url in sys.argv[1:]:
+        print(canonical_url(url), "->", index.lookup(url) or "absente du coffre")
@@ -0,0 +1,143 @@
+"""Index SQLite incrémental du coffre : une note n'est relue que si son mtime ou sa taille a changé
+
+python3 src/vaultindex.py   # état de l'index
+"""
+
+import os, json
+import sqlite3
+import threading
+from datetime import datetime, timezone
+
+import tools
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS notes (
+    file TEXT PRIMARY KEY,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL,
+    processed INTEGER NOT NULL,
+    header TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS notes_processed ON notes (processed);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+INSERT = "INSERT OR REPLACE INTO notes (file, mtime, size, created, processed, header) VALUES (?, ?, ?, ?, ?, ?)"
+
+
+class VaultIndex:
+
+    def __init__(self, path):
+        """
+        Args:
+            path: Base SQLite (créée au besoin)
+        """
+        self.path = path
+        self.lock = threading.Lock()
+        # Vrai si le dernier refresh a remplacé l'index d'un autre coffre (index des dates à reconstruire)
+        self.replaced = False
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.executescript(SCHEMA)
+
+    def refresh(self, sources_dir, parse):
+        """
+        Met l'index à jour : seules les notes nouvelles ou modifiées sont relues.
+
+        Args:
+            sources_dir: Répertoire des notes
+            parse: fonction(fichier, stat) -> (en-tête YAML ou None si note brute, date de création ou None)
+
+        Returns:
+            (notes relues, notes supprimées)
+        """
+        sources_dir = os.path.abspath(sources_dir)
+        with self.lock, self.db:
+            known = {file: (mtime, size) for file, mtime, size in self.db.execute("SELECT file, mtime, size FROM notes")}
+            row = self.db.execute("SELECT value FROM meta WHERE key = 'sources_dir'").fetchone()
+            self.replaced = bool(row) and row[0] != sources_dir
+            if self.replaced:
+                # Index d'un autre coffre (autre _param.yml, benchmark) : tout est relu
+                print(f"Index du coffre: {row[0]} remplacé par {sources_dir}")
+                self.db.execute("DELETE FROM notes")
+            self.db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('sources_dir', ?)", (sources_dir,))
+        valid = {} if self.replaced else known
+
+        rows = []
+        seen = set()
+        for entry, stat in tools.scan_notes(sources_dir):
+            seen.add(entry.name)
+            if valid.get(entry.name) == (stat.st_mtime, stat.st_size):
+                continue
+            header, created = parse(entry.name, stat)
+            rows.append(self.row(entry.name, stat, header, created))
+
+        # Une seule transaction (un seul fsync), même pour la construction initiale de tout le coffre
+        changed = [r[0] for r in rows]
+        removed = [file for file in known if file not in seen]
+        with self.lock, self.db:
+            self.db.executemany(INSERT, rows)
+            self.db.executemany("DELETE FROM notes WHERE file = ?", [(file,) for file in removed])
+        if changed or removed:
+            print(f"Index du coffre: {len(changed)} notes relues, {len(removed)} supprimées, {len(seen)} au total")
+        return changed, removed
+
+    @staticmethod
+    def row(file, stat, header, created):
+        return (file, stat.st_mtime, stat.st_size, created.timestamp() if created else None,
+                0 if header is None else 1, json.dumps(header or {}, ensure_ascii=False))
+
+    def update(self, file, stat, header, created):
+        """Enregistre l'état d'une note (en-tête None = note brute, pas encore traitée)"""
+        with self.lock, self.db:
+            self.db.execute(INSERT, self.row(file, stat, header, created))
+
+    def notes(self, processed=True):
+        """
+        Notes traitées (avec en-tête) ou brutes, par nom décroissant.
+
+        Returns:
+            Liste de (fichier, date de création ou None, en-tête)
+        """
+        with self.lock:
+            rows = self.db.execute(
+                "SELECT file, created, header FROM notes WHERE processed = ? ORDER BY file DESC",
+                (1 if processed else 0,)
+            ).fetchall()
+        return [
+            (file, datetime.fromtimestamp(created, tz=timezone.utc) if created is not None else None, json.loads(header))
+            for file, created, header in rows
+        ]
+
+    def get(self, file):
+        """(date de création ou None, en-tête) d'une note traitée, None si brute ou inconnue"""
+        with self.lock:
+            row = self.db.execute("SELECT created, header FROM notes WHERE file = ? AND processed = 1", (file,)).fetchone()
+        if not row:
+            return None
+        created = datetime.fromtimestamp(row[0], tz=timezone.utc) if row[0] is not None else None
+        return created, json.loads(row[1])
+
+    def count(self, processed=True):
+        with self.lock:
+            return self.db.execute("SELECT COUNT(*) FROM notes WHERE processed = ?", (1 if processed else 0,)).fetchone()[0]
+
+    def header(self, file):
+        """En-tête indexé d'une note ({} si brute ou inconnue)"""
+        with self.lock:
+            row = self.db.execute("SELECT header FROM notes WHERE file = ?", (file,)).fetchone()
+        return json.loads(row[0]) if row else {}
+
+
+def from_config(config):
+    """Index paramétré par _param.yml (fichier par défaut : _cache/vault.sqlite)"""
+    return VaultIndex(config.get('vault_index_file') or os.path.join(tools.cache_dir(), "vault.sqlite"))
+
+
+if __name__ == '__main__':
+    index = from_config(tools.site_yml('_param.yml'))
+    processed, raw = len(index.notes(True)), len(index.notes(False))
+    print(f"{index.path}: {processed} notes traitées, {raw} brutes")
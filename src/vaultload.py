@@ -0,0 +1,154 @@
+"""Chargement parallèle du coffre pour web.py : le serveur répond pendant que les notes arrivent
+
+L'index ne garde que les métadonnées (en-têtes) ; le corps d'un article n'est converti en HTML
+qu'à sa consultation, via un cache LRU borné en octets (RenderCache).
+"""
+
+import os, time
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import tools
+import notes
+import images
+
+
+def load_bookmark(item):
+    """(nom, chemin, stat) -> métadonnées affichées par web.py, ou None si la note est vide"""
+    filename, path, stat = item
+    if not stat.st_size:
+        return None
+    meta = notes.read_header(path) or {}
+    article_id = filename.replace('.md', '')
+    image = images.image_url(meta.get('image'))
+    return {
+        'id': article_id,
+        'title': meta.get('title', 'Titre non disponible'),
+        'link': meta.get('url', 'URL non disponible'),
+        'created': meta.get('created', 'Date non disponible'),
+        'image': meta.get('image', None),
+        'thumb': f"/thumb/{article_id}?v={images.url_key(image)}" if image else None,
+        'publish': meta.get('publish', None)
+    }
+
+
+class VaultLoader:
+
+    def __init__(self, items, workers=4, progress_every=1000):
+        """
+        Args:
+            items: Notes à charger, dans l'ordre d'affichage : (nom, chemin, stat)
+            workers: Processus de lecture des en-têtes (0 = dans le thread de chargement)
+            progress_every: Fréquence du message de progression (notes)
+        """
+        self.items = items
+        self.workers = workers
+        self.progress_every = progress_every
+        self.bookmarks = []
+        self.done = False
+        self.cond = threading.Condition()
+        self.pool = None
+
+    def start(self):
+        """Démarre le chargement en arrière-plan et rend la main aussitôt"""
+        context = tools.fork_context()
+        if self.workers > 0 and context is not None:
+            # Processus créés ici, dans le thread principal, avant le thread de chargement et Flask
+            self.pool = ProcessPoolExecutor(self.workers, mp_context=context)
+            self.pool.submit(int).result()
+        threading.Thread(target=self.run, name="vault-loader", daemon=True).start()
+        return self
+
+    def results(self):
+        if self.pool is None:
+            return map(load_bookmark, self.items)
+        # map conserve l'ordre : les premières pages sont disponibles en premier
+        return self.pool.map(load_bookmark, self.items, chunksize=64)
+
+    def run(self):
+        start = time.monotonic()
+        total = len(self.items)
+        try:
+            for count, bookmark in enumerate(self.results(), 1):
+                if bookmark:
+                    with self.cond:
+                        self.bookmarks.append(bookmark)
+                        self.cond.notify_all()
+                if count % self.progress_every == 0:
+                    print(f"Chargement: {count}/{total} notes ({time.monotonic() - start:.1f}s)")
+        except Exception as e:
+            print(f"Erreur de chargement du coffre: {e}")
+        finally:
+            if self.pool is not None:
+                self.pool.shutdown()
+            with self.cond:
+                self.done = True
+                self.cond.notify_all()
+        print(f"{len(self.bookmarks)} notes chargées en {time.monotonic() - start:.1f}s")
+
+    def wait_for(self, count, timeout=30):
+        """Attend que `count` bookmarks soient chargés (ou la fin du chargement)"""
+        with self.cond:
+            self.cond.wait_for(lambda: self.done or len(self.bookmarks) >= count, timeout)
+
+    def find(self, article_id, timeout=30):
+        """Bookmark par identifiant, en attendant la fin du chargement s'il n'est pas encore là"""
+        deadline = time.monotonic() + timeout
+        seen = 0
+        while True:
+            with self.cond:
+                loaded = len(self.bookmarks)
+                found = next((item for item in self.bookmarks[seen:loaded] if item['id'] == article_id), None)
+                if found or self.done:
+                    return found
+                seen = loaded
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    return None
+                self.cond.wait(left)
+
+
+class RenderCache:
+    """HTML des articles consultés, par identifiant et (mtime, taille), borné en octets (LRU)"""
+
+    def __init__(self, max_bytes=32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def render(self, article_id, path):
+        """HTML du corps de la note (None si illisible), converti au plus une fois par version"""
+        try:
+            stat = os.stat(path)
+        except OSError as e:
+            print(f"Error reading file {path}: {e}")
+            return None
+        version = (stat.st_mtime, stat.st_size)
+
+        with self.lock:
+            cached = self.entries.get(article_id)
+            if cached and cached[0] == version:
+                self.entries.move_to_end(article_id)
+                return cached[1]
+
+        import markdown
+
+        try:
+            with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+                html = markdown.markdown(notes.parse(f.read()).body)
+        except Exception as e:
+            print(f"Error reading file {path}: {e}")
+            return None
+
+        with self.lock:
+            old = self.entries.pop(article_id, None)
+            if old:
+                self.size -= len(old[1])
+            self.entries[article_id] = (version, html)
+            self.size += len(html)
+            while self.size > self.max_bytes and len(self.entries) > 1:
+                _, (_, evicted) = self.entries.popitem(last=False)
+                self.size -= len(evicted)
+        return html
@@ -0,0 +1,187 @@
+"""Mode surveillance : chaque nouvelle daily note est traitée quelques secondes après son arrivée
+
+python3 src/watch.py             # inotify sous Linux, scrutation ailleurs
+python3 src/watch.py --poll      # force la scrutation
+
+Au démarrage, rattrape les notes brutes en attente (get_new_bookmarks), puis attend que chaque
+note modifiée reste inchangée pendant watch_debounce secondes (écritures partielles du client
+de synchronisation) avant de l'envoyer à Bookmarks.process_note.
+"""
+
+import os, sys, time
+import struct
+import select
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import tools
+import articles
+import transport
+from papers import Bookmarks
+
+# inotify(7)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_CLOEXEC = 0o2000000
+EVENT = struct.Struct('iIII')
+
+
+class InotifySource:
+    """Événements du répertoire via inotify (ctypes, sans dépendance)"""
+
+    def __init__(self, directory):
+        import ctypes
+        import ctypes.util
+
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        if not hasattr(libc, 'inotify_init1'):
+            raise OSError("inotify indisponible")
+        self.fd = libc.inotify_init1(IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1")
+        mask = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), mask) < 0:
+            error = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(error, "inotify_add_watch")
+
+    def events(self, timeout):
+        """Noms des fichiers touchés (None : file d'événements débordée, tout rescanner)"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        data = os.read(self.fd, 64 * 1024)
+        names = []
+        offset = 0
+        while offset + EVENT.size <= len(data):
+            _, mask, _, length = EVENT.unpack_from(data, offset)
+            name = data[offset + EVENT.size:offset + EVENT.size + length].rstrip(b'\0')
+            offset += EVENT.size + length
+            if mask & IN_Q_OVERFLOW:
+                names.append(None)
+            elif name:
+                names.append(os.fsdecode(name))
+        return names
+
+
+class PollingSource:
+    """Repli multiplateforme : compare (mtime, taille) à chaque passage"""
+
+    def __init__(self, directory, interval=2.0):
+        self.directory = directory
+        self.interval = interval
+        self.snapshot = self.scan()
+
+    def scan(self):
+        return {entry.name: (stat.st_mtime, stat.st_size) for entry, stat in tools.scan_notes(self.directory)}
+
+    def events(self, timeout):
+        time.sleep(max(0.0, min(timeout, self.interval)))
+        snapshot = self.scan()
+        names = [name for name, signature in snapshot.items() if self.snapshot.get(name) != signature]
+        self.snapshot = snapshot
+        return names
+
+
+def open_source(directory, poll=False, interval=2.0):
+    if not poll and sys.platform.startswith('linux'):
+        try:
+            return InotifySource(directory)
+        except OSError as e:
+            print(f"inotify indisponible ({e}), scrutation toutes les {interval}s")
+    return PollingSource(directory, interval)
+
+
+class NoteWatcher:
+
+    def __init__(self, bookmarks, debounce=3.0, interval=2.0, poll=False):
+        """
+        Args:
+            bookmarks: Instance de Bookmarks
+            debounce: Silence (s) exigé sur une note avant de la traiter
+            interval: Période de scrutation (s) sans inotify
+            poll: Forcer la scrutation
+        """
+        self.bookmarks = bookmarks
+        self.debounce = debounce
+        self.interval = interval
+        self.poll = poll
+        self.pending = {}
+        self.busy = set()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def is_note(name):
+        # Fichiers temporaires des clients de synchronisation : .note.md.tmp, note.md~...
+        return name.endswith('.md') and not name.startswith('.')
+
+    def process(self, name):
+        try:
+            # Budget propre à la note : le moteur, partagé par tout le processus, épuiserait
+            # sinon run_budget_minutes une fois pour toutes
+            count = self.bookmarks.process_note(name, articles.run_budget())
+            if count:
+                print(f"{name}: {count} URL(s) traitée(s). {transport.report()}")
+        except Exception as e:
+            print(f"Erreur de traitement pour {name}: {e}")
+        finally:
+            with self.lock:
+                self.busy.discard(name)
+
+    def rescan(self):
+        try:
+            self.bookmarks.get_new_bookmarks(budget=articles.run_budget())
+        except Exception as e:
+            print(f"Erreur de rattrapage: {e}")
+
+    def run(self):
+        source = open_source(self.bookmarks.sources_dir, self.poll, self.interval)
+        print(f"Surveillance de {self.bookmarks.sources_dir} ({type(source).__name__})")
+
+        # Processus de parsing créés avant tout thread de téléchargement
+        articles.parser_pool()
+        self.rescan()
+
+        with ThreadPoolExecutor(max_workers=self.bookmarks.workers) as pool:
+            while True:
+                now = time.monotonic()
+                timeout = min([due - now for due in self.pending.values()] + [self.interval])
+                for name in source.events(max(0.0, timeout)):
+                    if name is None:
+                        pool.submit(self.rescan)
+                    elif self.is_note(name):
+                        # Chaque écriture repousse l'échéance : la note est traitée une fois stable
+                        self.pending[name] = time.monotonic() + self.debounce
+
+                now = time.monotonic()
+                for name in [n for n, due in self.pending.items() if due <= now]:
+                    with self.lock:
+                        if name in self.busy:
+                            self.pending[name] = now + self.debounce
+                            continue
+                        self.busy.add(name)
+                    del self.pending[name]
+                    pool.submit(self.process, name)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--poll', action='store_true', help="Scrutation au lieu d'inotify")
+    args = parser.parse_args()
+
+    config = tools.site_yml('_param.yml')
+    bookmarks = Bookmarks(config)
+    watcher = NoteWatcher(
+        bookmarks,
+        float(config.get('watch_debounce', 3)),
+        float(config.get('watch_interval', 2)),
+        args.poll
+    )
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        print(transport.report())
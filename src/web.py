@@ -1,9 +1,11 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, render_template, request, jsonify, send_file, redirect
 import os
-import markdown
 from papers import Bookmarks
 
 import tools
+import images
+import transport
+from vaultload import VaultLoader, RenderCache
 
 config = tools.site_yml('_param.yml')
 
@@ -13,63 +15,18 @@ book = Bookmarks(config)
 app = Flask(__name__)
 
 
-def parse_yaml_from_content(content):
-    yaml_data = {}
-    
-    # Trouver les délimiteurs YAML
-    yaml_start = content.find('---')
-    yaml_end = content.find('---', yaml_start + 3)
-    
-    if yaml_start != -1 and yaml_end != -1:
-        # Extraire le contenu du YAML
-        yaml_content = content[yaml_start+3:yaml_end].strip()
-        
-        # Traiter chaque ligne
-        for line in yaml_content.splitlines():
-            if ':' in line:
-                key, value = line.split(':', 1)
-                yaml_data[key.strip()] = value.strip()
-    
-    return yaml_data
-    
-
-def extract_main_text(content):
-    # Chercher la première occurrence d'un titre de niveau 1
-    title_start = content.find('# ')
-    if title_start != -1:
-        # Trouver la fin de la ligne du titre
-        title_end = content.find('\n', title_start)
-        if title_end != -1:
-            # Récupérer le texte principal après le titre
-            main_text = content[title_end+1:].strip()
-            return main_text
-
-    return ""
-
 def load_bookmarks_from_markdown():
-    bookmarks = []
-        
-    files = [filename for filename in os.listdir(book.sources_dir) if filename.endswith('.md')]
-    files.sort(reverse=True)
+    """Lance le chargement parallèle du coffre ; la liste se remplit pendant que le serveur répond"""
+    # Un scandir (voir tools.scan_notes) ; seuls les en-têtes sont lus, les notes vides sont écartées par leur taille
+    files = sorted(tools.scan_notes(book.sources_dir), key=lambda item: item[0].name, reverse=True)
+    items = [(entry.name, entry.path, stat) for entry, stat in files]
+    return VaultLoader(items, int(config.get('web_workers', 4))).start()
 
-    for filename in files:
-        if filename.endswith('.md'):
-            content= book.read_markdown(filename)
-            if content:
-                meta = parse_yaml_from_content(content)
-                bookmark = {
-                    'id': filename.replace('.md', ''),
-                    'title': meta.get('title', 'Titre non disponible'),
-                    'link': meta.get('url', 'URL non disponible'),
-                    'created': meta.get('created', 'Date non disponible'),
-                    'text': markdown.markdown(extract_main_text(content)),
-                    'image': meta.get('image', None),
-                    'publish':meta.get('publish', None)
-                }
-                bookmarks.append(bookmark)
-    return bookmarks
+vault = load_bookmarks_from_markdown()
+bookmarks = vault.bookmarks
 
-bookmarks = load_bookmarks_from_markdown()
+# Corps des articles convertis à la demande (voir vaultload.RenderCache)
+rendered = RenderCache(int(config.get('web_render_cache_mb', 32)) * 1024 * 1024)
 print("Ouvrez http://127.0.0.1:5000/ dans votre navigateur.")
 
 @app.route('/')
@@ -83,18 +40,38 @@ def api_bookmarks():
     per_page = 50
     start = (page - 1) * per_page
     end = start + per_page
+    vault.wait_for(end)
     data = bookmarks[start:end]
     return jsonify(data)
 
 @app.route('/article/<article_id>')
 def article(article_id):
     print(f"Route /article/{article_id} appelée")
-    article_data = next((item for item in bookmarks if item["id"] == article_id), None)
-    if article_data:
-        return render_template('article.html', article=article_data, content=article_data["text"])
+    article_data = vault.find(article_id)
+    content = rendered.render(article_id, book.file_path(article_id + '.md')) if article_data else None
+    if content is not None:
+        return render_template('article.html', article=article_data, content=content)
     else:
         print(f"Erreur : Article {article_id} non trouvé.")
         return "Article not found", 404
 
+@app.route('/thumb/<article_id>')
+def thumb(article_id):
+    """Vignette locale de l'image principale (téléchargée à la première demande)"""
+    article_data = vault.find(article_id)
+    if not article_data or not images.image_url(article_data['image']):
+        return "Image not found", 404
+    cached = book.images.get(article_data['image'], transport.session())
+    if not cached:
+        return redirect(images.image_url(article_data['image']))
+    path, mimetype, digest = cached
+    if request.args.get('v') != images.url_key(images.image_url(article_data['image'])):
+        # URL sans version (ou périmée) : revalidée par l'ETag
+        return send_file(path, mimetype=mimetype, etag=digest, max_age=0)
+    # La version change avec l'image de la note : l'URL peut être gardée indéfiniment
+    response = send_file(path, mimetype=mimetype, etag=digest, max_age=31536000)
+    response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
+
 if __name__ == '__main__':
     app.run(debug=True)
\ No newline at end of file
@@ -0,0 +1,4 @@
+import os, sys
+
+# Modules à plat dans src/, importés comme par les scripts (python3 src/papers.py)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
@@ -0,0 +1,85 @@
+import pytest
+
+pytest.importorskip("selenium")
+
+from selenium.common.exceptions import TimeoutException, WebDriverException, InvalidSessionIdException
+
+import browser
+
+
+class FakeDriver:
+    def __init__(self, broken_reset=False):
+        self.broken_reset = broken_reset
+        self.quit_called = False
+
+    def set_page_load_timeout(self, timeout):
+        pass
+
+    def delete_all_cookies(self):
+        if self.broken_reset:
+            raise WebDriverException("chrome not reachable")
+
+    def execute_script(self, script):
+        pass
+
+    def get(self, url):
+        pass
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    created = []
+
+    def new_driver():
+        created.append(FakeDriver())
+        return created[-1]
+
+    monkeypatch.setattr(browser, "new_driver", new_driver)
+    pool = browser.DriverPool(size=1)
+    pool.created = created
+    return pool
+
+
+def test_driver_is_reused(pool):
+    with pool.lease() as first:
+        pass
+    with pool.lease() as second:
+        pass
+    assert first is second
+
+
+def test_slow_page_keeps_driver(pool):
+    with pytest.raises(TimeoutException):
+        with pool.lease():
+            raise TimeoutException("readyState")
+    with pool.lease():
+        pass
+    assert len(pool.created) == 1
+
+
+def test_dead_session_is_recycled(pool):
+    with pytest.raises(InvalidSessionIdException):
+        with pool.lease() as driver:
+            raise InvalidSessionIdException("invalid session id")
+    assert driver.quit_called
+    with pool.lease() as other:
+        pass
+    assert other is not driver
+
+
+def test_failed_reset_does_not_raise(pool):
+    with pool.lease() as driver:
+        driver.broken_reset = True
+        html = "<html>déjà chargé</html>"
+    assert html
+    assert driver.quit_called
+    assert driver not in pool.drivers
+
+
+def test_is_dead_session():
+    assert browser.is_dead_session(WebDriverException("unknown error: chrome not reachable"))
+    assert not browser.is_dead_session(TimeoutException("timeout"))
+    assert not browser.is_dead_session(ValueError("x"))
@@ -0,0 +1,25 @@
+from datetime import datetime, timezone
+
+from dateindex import DateIndex
+
+
+def day(d):
+    return datetime(2024, 1, d, tzinfo=timezone.utc)
+
+
+def test_between_is_inclusive_and_newest_first(tmp_path):
+    index = DateIndex(str(tmp_path / "dates.json"))
+    index.rebuild({'a.md': day(1), 'b.md': day(5), 'c.md': day(10), 'd.md': None})
+    assert len(index) == 3
+    assert [f for f, _ in index.between(day(1), day(5))] == ['b.md', 'a.md']
+    assert index.between(day(6), day(9)) == []
+
+
+def test_update_moves_and_removes(tmp_path):
+    path = str(tmp_path / "dates.json")
+    index = DateIndex(path)
+    index.rebuild({'a.md': day(1), 'b.md': day(5)})
+    index.update({'a.md': day(7), 'c.md': day(3)}, removed=['b.md'])
+    assert [f for f, _ in index.between(day(1), day(31))] == ['a.md', 'c.md']
+    index.update({'c.md': None})
+    assert [f for f, _ in DateIndex(path).between(day(1), day(31))] == ['a.md']
@@ -0,0 +1,63 @@
+from engine import ExtractionEngine, RunBudget, NotAnArticle, is_network_failure
+import extractors
+
+
+class Board:
+    def order(self, host, strategies):
+        return strategies
+
+    def record(self, host, strategy, success, duration):
+        pass
+
+
+def failing(strategy, url, timeout):
+    raise Exception("Téléchargement échoué (503)")
+
+
+def not_html(strategy, url, timeout):
+    raise NotAnArticle("contenu non HTML (application/pdf)")
+
+
+def test_http_errors_are_network_failures():
+    result = ExtractionEngine(failing, Board()).run("https://example.com/a", ["mode1", "mode2"])
+    assert is_network_failure(result)
+    assert not extractors.is_deferred(result)
+
+
+def test_not_an_article_is_not_a_network_failure():
+    result = ExtractionEngine(not_html, Board()).run("https://arxiv.org/pdf/1", ["mode1", "mode2"])
+    assert result['text'] == "No Text"
+    assert not is_network_failure(result)
+
+
+def test_exhausted_budget_defers_url():
+    budget = RunBudget(1)
+    budget.start -= 2
+    result = ExtractionEngine(failing, Board(), budget=budget).run("https://example.com/a", ["mode1"])
+    assert extractors.is_deferred(result)
+    assert result['attempts'] == []
+
+
+def test_call_budget_overrides_engine_budget():
+    spent = RunBudget(1)
+    spent.start -= 2
+    engine = ExtractionEngine(failing, Board(), budget=spent)
+    assert extractors.is_deferred(engine.run("https://example.com/a", ["mode1"]))
+    result = engine.run("https://example.com/a", ["mode1"], RunBudget(60))
+    assert not extractors.is_deferred(result)
+    assert len(result['attempts']) == 1
+
+
+def test_http_error_never_falls_back_to_homepage():
+    fetched = []
+
+    def fetch(strategy, url, timeout):
+        fetched.append(url)
+        if url == "https://news.example.com/2024/dead-article":
+            raise Exception(f"Téléchargement échoué (404) pour {url}")
+        return {'content': "<p>" + "accueil " * 100 + "</p>", 'url': url}
+
+    result = ExtractionEngine(fetch, Board()).run("https://news.example.com/2024/dead-article", ["mode1", "mode2"])
+    assert set(fetched) == {"https://news.example.com/2024/dead-article"}
+    assert result['text'] == "No Text"
+    assert result['canonical_link'] == "https://news.example.com/2024/dead-article"
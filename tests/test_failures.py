@@ -0,0 +1,45 @@
+from failures import FailureRegistry
+
+
+def registry(tmp_path, **kwargs):
+    return FailureRegistry(str(tmp_path / "failures.json"), **kwargs)
+
+
+def test_failed_url_is_blocked_then_cleared_by_success(tmp_path):
+    reg = registry(tmp_path)
+    url = "https://example.com/a"
+    assert reg.blocked(url) is None
+    reg.record_failure(url, "HTTP 500")
+    assert "HTTP 500" in reg.blocked(url)
+    reg.record_success(url)
+    assert reg.blocked(url) is None
+
+
+def test_host_blocked_after_network_failures(tmp_path):
+    reg = registry(tmp_path, host_after=3)
+    for i in range(3):
+        reg.record_failure(f"https://example.com/{i}", "connexion refusée")
+    assert reg.blocked("https://example.com/never-tried")
+
+
+def test_non_network_failures_do_not_block_host(tmp_path):
+    reg = registry(tmp_path, host_after=3)
+    for i in range(5):
+        reg.record_failure(f"https://arxiv.org/pdf/{i}", "contenu non HTML (application/pdf)", host=False)
+    assert reg.blocked("https://arxiv.org/pdf/0")
+    assert reg.blocked("https://arxiv.org/abs/2401.00001") is None
+
+
+def test_backoff_doubles_up_to_max(tmp_path):
+    reg = registry(tmp_path, backoff_hours=1, max_days=1)
+    assert reg.delay(1) == 3600
+    assert reg.delay(2) == 7200
+    assert reg.delay(20) == 86400
+
+
+def test_registry_is_persisted(tmp_path):
+    reg = registry(tmp_path)
+    reg.record_failure("https://example.com/a", "HTTP 404")
+    assert registry(tmp_path).blocked("https://example.com/a")
+    reg.clear("https://example.com/a")
+    assert registry(tmp_path).blocked("https://example.com/a") is None
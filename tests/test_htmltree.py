@@ -0,0 +1,42 @@
+import pytest
+
+import htmltree
+
+PAGE = "<html><body><article><p>Café déjà été</p></article></body></html>"
+
+
+def test_utf8_without_meta_charset():
+    assert htmltree.decode_html(PAGE.encode('utf-8')) == PAGE
+
+
+def test_header_charset_wins():
+    body = PAGE.encode('latin-1')
+    assert htmltree.decode_html(body, "text/html; charset=ISO-8859-1") == PAGE
+
+
+def test_meta_charset():
+    page = '<meta charset="windows-1252">' + PAGE
+    assert htmltree.decode_html(page.encode('cp1252')) == page
+
+
+def test_bom_and_unknown_charset():
+    assert htmltree.decode_html(b'\xef\xbb\xbf' + PAGE.encode('utf-8')) == PAGE
+    assert htmltree.decode_html(PAGE.encode('utf-8'), "text/html; charset=nope") == PAGE
+
+
+def test_truncated_utf8_keeps_page():
+    body = PAGE.encode('utf-8')
+    cut = body[:body.index('é'.encode('utf-8')) + 1]
+    assert htmltree.decode_html(cut) == PAGE[:PAGE.index('é')]
+
+
+def test_undeclared_latin1_falls_back_to_cp1252():
+    assert htmltree.decode_html(PAGE.encode('cp1252')) == PAGE
+
+
+@pytest.mark.skipif(not htmltree.HAVE_LXML, reason="lxml absent")
+def test_lxml_reads_utf8_bytes():
+    htmltree.set_backend('lxml')
+    page = PAGE.replace("Café déjà été", "Café déjà été. " * 20)
+    title, text, src = htmltree.manual_fields(page.encode('utf-8'))
+    assert text.startswith("Café déjà été.")
@@ -0,0 +1,42 @@
+import os
+
+from httpcache import HttpCache, normalize_url
+
+
+def test_normalize_url():
+    assert normalize_url("HTTPS://Example.COM#top") == "https://example.com/"
+
+
+def test_hit_does_not_rewrite_index(tmp_path):
+    cache = HttpCache(str(tmp_path))
+    cache.put("https://example.com/a", "https://example.com/a", b"body", {'ETag': '"x"'})
+    os.utime(cache.index_path, ns=(0, 0))
+    entry = cache.get("https://example.com/a")
+    assert entry['body'] == b"body"
+    assert cache.conditional_headers(entry) == {'If-None-Match': '"x"'}
+    assert os.stat(cache.index_path).st_mtime_ns == 0
+    cache.flush()
+    assert os.stat(cache.index_path).st_mtime_ns != 0
+
+
+def test_lru_eviction(tmp_path):
+    cache = HttpCache(str(tmp_path), max_bytes=10)
+    cache.put("https://example.com/a", "https://example.com/a", b"123456", {'ETag': '"a"'})
+    cache.put("https://example.com/b", "https://example.com/b", b"123456", {'ETag': '"b"'})
+    assert cache.get("https://example.com/a") is None
+    assert cache.get("https://example.com/b")['body'] == b"123456"
+
+
+def test_redirect_entries_expire(tmp_path):
+    cache = HttpCache(str(tmp_path))
+    cache.put("https://flip.it/a", "https://example.com/a", kind="HEAD", ttl=60)
+    assert cache.get("https://flip.it/a", kind="HEAD")['final_url'] == "https://example.com/a"
+    cache.put("https://flip.it/b", "https://example.com/b", kind="HEAD", ttl=-1)
+    assert cache.get("https://flip.it/b", kind="HEAD") is None
+    assert cache.get("https://flip.it/b", kind="HEAD") is None
+
+
+def test_legacy_redirect_entry_without_expiry_is_dropped(tmp_path):
+    cache = HttpCache(str(tmp_path))
+    cache.put("https://flip.it/a", "https://flip.it/a", kind="HEAD")
+    assert cache.get("https://flip.it/a", kind="HEAD") is None
@@ -0,0 +1,57 @@
+import os
+
+import notes
+
+NOTE = """---
+title: "Un titre: avec deux-points"
+url: https://example.com/a
+---
+
+# Un titre
+
+![image](https://example.com/a.jpg)
+
+Premier paragraphe.
+
+Second paragraphe.
+"""
+
+
+def test_parse_header_title_image_body():
+    note = notes.parse(NOTE)
+    assert note.header == {'title': "Un titre: avec deux-points", 'url': "https://example.com/a"}
+    assert note.title == "Un titre"
+    assert note.image == "![image](https://example.com/a.jpg)"
+    assert note.body.startswith("![image]")
+    assert note.first_para() == "Premier paragraphe."
+
+
+def test_raw_note_has_no_header():
+    note = notes.parse("https://example.com/a commentaire\n")
+    assert note.header is None
+    assert note.title is None
+    assert note.body == ""
+    assert note.first_para() == ""
+
+
+def test_unclosed_header_is_raw():
+    assert notes.parse("---\ntitle: x\n").header is None
+
+
+def test_read_header_stops_at_closing_marker(tmp_path):
+    path = tmp_path / "a.md"
+    path.write_text(NOTE, encoding='utf-8')
+    assert notes.read_header(str(path))['url'] == "https://example.com/a"
+    path.write_text("pas d'en-tête\n", encoding='utf-8')
+    assert notes.read_header(str(path)) is None
+
+
+def test_load_is_cached_until_file_changes(tmp_path):
+    path = tmp_path / "a.md"
+    path.write_text(NOTE, encoding='utf-8')
+    first = notes.load(str(path))
+    assert notes.load(str(path)) is first
+    path.write_text(NOTE + "\nAjout.\n", encoding='utf-8')
+    os.utime(path, (0, 1))
+    assert notes.load(str(path)) is not first
+    assert notes.load(str(tmp_path / "absent.md")) is None
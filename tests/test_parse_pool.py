@@ -0,0 +1,38 @@
+import sys
+import time
+
+import pytest
+
+import articles
+import extractors
+
+
+def slow_extract(html_content, url):
+    time.sleep(5)
+    return None
+
+
+@pytest.fixture
+def reset_pool():
+    yield
+    if articles._parser_pool is not None:
+        articles._parser_pool.shutdown(wait=False, cancel_futures=True)
+    articles._parser_pool = None
+    articles.config.pop('parse_workers', None)
+
+
+def test_parse_never_creates_the_pool(reset_pool, monkeypatch):
+    articles.config['parse_workers'] = 2
+    monkeypatch.setattr(extractors, "extract", lambda html_content, url: "inline")
+    assert articles.parse("<html></html>", "https://example.com/") == "inline"
+    assert articles._parser_pool is None
+
+
+@pytest.mark.skipif(not sys.platform.startswith('linux'), reason="pool créé par fork sous Linux seulement")
+def test_stuck_worker_respects_timeout(reset_pool, monkeypatch):
+    monkeypatch.setattr(extractors, "extract", slow_extract)
+    articles.config['parse_workers'] = 1
+    assert articles.parser_pool() is not None
+    start = time.monotonic()
+    assert articles.parse("<html></html>", "https://example.com/", timeout=0.5) is None
+    assert time.monotonic() - start < 3
@@ -0,0 +1,19 @@
+import pytest
+
+from ratelimit import TokenBucket, HostLimiter
+
+
+def test_burst_then_delay():
+    bucket = TokenBucket(rate=1.0, burst=2)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(1.0, abs=0.05)
+    assert bucket.reserve() == pytest.approx(2.0, abs=0.05)
+
+
+def test_hosts_are_independent_and_overridable():
+    limiter = HostLimiter(rate=1.0, burst=1, overrides={'example.com': {'rate': 10, 'burst': 5}})
+    assert limiter.bucket('a.org').reserve() == 0
+    assert limiter.bucket('b.org').reserve() == 0
+    bucket = limiter.bucket('www.example.com')
+    assert (bucket.rate, bucket.burst) == (10.0, 5.0)
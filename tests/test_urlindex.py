@@ -0,0 +1,45 @@
+import pytest
+
+from urlindex import canonical_url, UrlIndex
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("https://www.Example.com/a/", "example.com/a"),
+    ("http://example.com:80/a", "example.com/a"),
+    ("https://example.com:8443/a", "example.com:8443/a"),
+    ("https://example.com/a?utm_source=x&b=2&fbclid=y#top", "example.com/a?b=2"),
+    ("https://example.com/a?b=2&a=1", "example.com/a?a=1&b=2"),
+    ("https://amp.example.com/news/2024/story", "example.com/news/2024/story"),
+    ("https://example.com/news/2024/story/amp", "example.com/news/2024/story"),
+    ("https://example.com/news/2024/story/amp/", "example.com/news/2024/story"),
+    ("https://example.com/news/story.amp", "example.com/news/story"),
+    ("https://example.com/news/story.amp.html", "example.com/news/story.html"),
+    ("https://example-com.cdn.ampproject.org/c/s/example.com/news/story.amp", "example.com/news/story"),
+    ("https://www.google.com/amp/s/example.com/a.amp", "example.com/a"),
+])
+def test_canonical_url(url, expected):
+    assert canonical_url(url) == expected
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("https://github.com/foo/amp", "github.com/foo/amp"),
+    ("https://example.com/amp", "example.com/amp"),
+    ("https://example.com/amp/docs", "example.com/amp/docs"),
+])
+def test_amp_pages_are_kept(url, expected):
+    assert canonical_url(url) == expected
+
+
+def test_amp_variants_match_direct_url():
+    direct = canonical_url("https://example.com/a")
+    assert canonical_url("https://www.google.com/amp/s/example.com/a.amp") == direct
+    assert canonical_url("https://amp.example.com/a") == direct
+
+
+def test_index_lookup_and_latest_wins(tmp_path):
+    index = UrlIndex(str(tmp_path / "urls.json"))
+    index.add("a.md", "https://www.example.com/story?utm_source=x")
+    assert index.lookup("http://example.com/story/") == "a.md"
+    index.add("b.md", "https://example.com/story")
+    assert index.lookup("https://example.com/story") == "b.md"
+    assert index.lookup("https://example.com/other") is None
@@ -0,0 +1,44 @@
+from vaultindex import VaultIndex
+
+
+def parse(file, stat):
+    return {'title': file}, None
+
+
+def test_only_changed_notes_are_reread(tmp_path):
+    vault = tmp_path / "vault"
+    vault.mkdir()
+    (vault / "a.md").write_text("a")
+    index = VaultIndex(str(tmp_path / "vault.sqlite"))
+    assert index.refresh(str(vault), parse) == (['a.md'], [])
+    assert index.refresh(str(vault), parse) == ([], [])
+    assert index.header('a.md') == {'title': 'a.md'}
+
+
+def test_other_vault_resets_index(tmp_path):
+    first, second = tmp_path / "first", tmp_path / "second"
+    first.mkdir()
+    second.mkdir()
+    (first / "a.md").write_text("a")
+    (second / "b.md").write_text("b")
+    index = VaultIndex(str(tmp_path / "vault.sqlite"))
+    index.refresh(str(first), parse)
+    assert not index.replaced
+    assert index.refresh(str(second), parse) == (['b.md'], ['a.md'])
+    assert index.replaced
+    assert index.refresh(str(second), parse) == ([], [])
+    assert not index.replaced
+
+
+def test_first_build_is_one_transaction(tmp_path):
+    vault = tmp_path / "vault"
+    vault.mkdir()
+    for i in range(50):
+        (vault / f"{i:03}.md").write_text("x")
+    index = VaultIndex(str(tmp_path / "vault.sqlite"))
+    commits = []
+    index.db.set_trace_callback(lambda sql: commits.append(sql) if sql.strip().upper() == "COMMIT" else None)
+    changed, _ = index.refresh(str(vault), parse)
+    assert len(changed) == 50
+    assert index.count(processed=True) == 50
+    assert len(commits) <= 2
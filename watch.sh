@@ -0,0 +1,4 @@
+#!/bin/bash
+#chmod +x watch.sh
+source venv/bin/activate
+python3 "src/watch.py"